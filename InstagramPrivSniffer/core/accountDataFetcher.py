@@ -3,45 +3,83 @@ Copyright (c) 2025 obitouka
 See the file 'LICENSE' for copying permission
 """
 
+import os
+import json
 import requests
+from core import profileCache
+from core.rateLimiter import rateLimitedGet
 from utils.colorPrinter import *
 from datetime import datetime
 
 time = datetime.now().strftime("%H:%M:%S")
 
-def fetch_data(username):
+# IG_BASE_URL points the fetcher at mock_server.py for offline runs
+BASE_URL = os.environ.get("IG_BASE_URL", "https://www.instagram.com").rstrip("/")
+HEADERS = {
+    "X-IG-App-ID": "936619743392459",
+}
+
+# Legacy GraphQL query for a user's timeline; answers in the same shape as
+# web_profile_info's edge_owner_to_timeline_media, one page per end_cursor
+TIMELINE_QUERY_HASH = "e769aa130647d2354c40ea6a439bfc08"
+PAGE_SIZE = 12
+TIMEOUT = 30    # seconds per request
+
+def fetch_data(username, max_posts=None, since=None):
     # colorPrint(
     #     CYAN, f"[{time()}] \t",
     #     GREEN, "[INFO] \t\t\b", 
     #     LIGHT_YELLOW_EX, "Fetching only collaborated posts (if available)..."
     # )
-    
+
+    return list(stream_posts(username, max_posts, since))
+
+
+def stream_posts(username, max_posts=None, since=None, session=None):
+    # Generator version of fetch_data: yields post URLs as each timeline page arrives,
+    # so callers can start on the first post before later pages are requested
+    user_data = fetch_profile(username, session)
+    if user_data is None:
+        return
+
+    account_type(user_data)
+    yield from iter_posts(user_data, max_posts, since, session)
+
+
+def fetch_profile(username, session=None):
+    # web_profile_info's user object (with the first timeline page); None on failure.
+    # Read through the on-disk profile cache, shared with the media downloader
+    user_data = profileCache.getProfile(username)
+    if user_data is not None:
+        colorPrint(
+            CYAN, f"[{time()}] \t",
+            GREEN, "[CACHE] \t\b",
+            LIGHT_YELLOW_EX, f"Using cached profile of {username}"
+        )
+        return user_data
+
+    response = None
+
     try:
-        url = f"https://www.instagram.com/api/v1/users/web_profile_info/?username={username}"
-        headers = {
-            "X-IG-App-ID": "936619743392459",
-        }
-        response = requests.get(url, headers=headers)
+        url = f"{BASE_URL}/api/v1/users/web_profile_info/?username={username}"
+        response = rateLimitedGet(url, session=session, headers=HEADERS, timeout=TIMEOUT)
 
         if response.status_code != 200:
             error_handler(response)
-            return 
+            return None
 
         user_data = response.json()["data"]["user"]
-        
-        account_type(user_data)
-        result = get_posts(user_data)
-        
-        return result
+        profileCache.putProfile(username, user_data)
+        return user_data
         
     except Exception as e:
         colorPrint(
             CYAN, f"[{time()}] \t",
-            RED, f"[{response.status_code}] \t\t\b",
+            RED, f"[{response.status_code if response is not None else '---'}] \t\t\b",
             YELLOW, "[WARNING] \t",
             RED, "Failed to fetch account data"
         )
-        return []
+        return None
         
 
 
@@ -53,12 +91,12 @@ def error_handler(response):
             RED, "[ERROR] \t\t",
             RED, "User not found"
         )
-    elif response.status_code == 401:
+    elif response.status_code in (401, 429):
         colorPrint(
             CYAN, f"[{time()}] \t",
-            RED, "[401] \t\t\b",
+            RED, f"[{response.status_code}] \t\t\b",
             YELLOW, "[WARNING] \t",
-            RED, "Instagram added rate limit to your IP. Try again later"
+            RED, "Instagram added rate limit to your IP. Still limited after backing off, try again later"
         )
     else:
         colorPrint(
@@ -84,37 +122,131 @@ def account_type(user_data):
         )
 
 
-def get_posts(user_data):
-    edges = user_data["edge_owner_to_timeline_media"]["edges"]
-    result = []
-    
-    if not edges:
+def get_posts(user_data, max_posts=None, since=None):
+    return list(iter_posts(user_data, max_posts, since))
+
+
+def iter_posts(user_data, max_posts=None, since=None, session=None):
+    # Walks every timeline page via page_info.end_cursor, newest post first.
+    # Stops after max_posts posts, or at the first post older than since (a datetime)
+    cutoff = since.timestamp() if since else None
+    i = 0
+
+    for post_data in iter_timeline(user_data, session):
+        if cutoff and post_data.get("taken_at_timestamp", 0) < cutoff:
+            # Pinned posts sit on top of the timeline whatever their date
+            if post_data.get("pinned_for_users"):
+                continue
+            colorPrint(
+                CYAN, f"[{time()}] \t",
+                GREEN, "[STOP]  \t\b",
+                LIGHT_YELLOW_EX, f"Reached posts older than {since:%Y-%m-%d}"
+            )
+            return
+
+        i += 1
+        post_url = post_data["shortcode"]
+        is_video = post_data["is_video"]
+        post_owner = post_data["owner"]["username"]
+
+        colorPrint(YELLOW, f"+--------------------------------------------------------[{i}]-------------------------------------------------------+\n")
+
+        if is_video:
+            colorPrint(
+                CYAN, f"[{time()}] \t",
+                GREEN, "[VIDEO]  \t\b",
+                LIGHT_BLUE_EX, f"{BASE_URL}/{post_owner}/reel/{post_url}"
+            )
+            yield f"{BASE_URL}/{post_owner}/reel/{post_url}"
+        else:
+            yield f"{BASE_URL}/{post_owner}/p/{post_url}"
+
+        if max_posts and i >= max_posts:
+            return
+
+    if not i:
         colorPrint(
             CYAN, f"[{time()}] \t",
             GREEN, "[POST]  \t\b",
             RED, "No posts found"
         )
-    else:
-        
-        for i, post_item in enumerate(edges, 1):
-            post_data = post_item["node"]
-            post_url = post_data["shortcode"]
-            is_video = post_data["is_video"]
-            post_owner = post_data["owner"]["username"]
-
-            colorPrint(YELLOW, f"+--------------------------------------------------------[{i}]-------------------------------------------------------+\n")
-
-            if is_video:
-                result.append(f"https://www.instagram.com/{post_owner}/reel/{post_url}")
-                colorPrint(
-                    CYAN, f"[{time()}] \t",
-                    GREEN, "[VIDEO]  \t\b",
-                    LIGHT_BLUE_EX, f"https://www.instagram.com/{post_owner}/reel/{post_url}"
-                )
-            else:
-                result.append(f"https://www.instagram.com/{post_owner}/p/{post_url}")
-                
-        return result
+
+
+def iter_timeline(user_data, session=None):
+    # Every timeline node, newest first: the pages already in user_data, then the next ones
+    # via end_cursor (appended to the profile cache as they arrive)
+    timeline = user_data["edge_owner_to_timeline_media"]
+    while True:
+        for post_item in timeline["edges"]:
+            yield post_item["node"]
+
+        page_info = timeline.get("page_info") or {}
+        if not page_info.get("has_next_page") or not page_info.get("end_cursor"):
+            return
+
+        timeline = fetch_timeline_page(user_data["id"], page_info["end_cursor"], session)
+        if timeline is None:
+            return
+        profileCache.extendTimeline(user_data["username"], user_data, timeline)
+
+
+def find_post(username, shortcode, session=None):
+    # Timeline node of one post; pages past the first 12 posts when needed and caches those pages
+    return find_posts(username, [shortcode], session).get(shortcode)
+
+
+def find_posts(username, shortcodes, session=None):
+    # {shortcode: timeline node} for several posts of one account, from one profile fetch
+    # and one timeline walk that stops as soon as all of them are found
+    wanted = set(shortcodes)
+    found = {}
+    user_data = fetch_profile(username, session)
+    if user_data is None or not wanted:
+        return found
+
+    for node in iter_timeline(user_data, session):
+        if node["shortcode"] in wanted:
+            found[node["shortcode"]] = node
+            if len(found) == len(wanted):
+                break
+    return found
+
+
+def fetch_timeline_page(user_id, cursor, session=None):
+    # One more page of the timeline after cursor; None when it can't be fetched,
+    # so paging stops with the posts found so far
+    variables = json.dumps({"id": user_id, "first": PAGE_SIZE, "after": cursor}, separators=(",", ":"))
+    try:
+        response = rateLimitedGet(
+            f"{BASE_URL}/graphql/query/",
+            session=session,
+            params={"query_hash": TIMELINE_QUERY_HASH, "variables": variables},
+            headers=HEADERS,
+            timeout=TIMEOUT
+        )
+    except requests.RequestException:
+        colorPrint(
+            CYAN, f"[{time()}] \t",
+            RED, "[---] \t\t\b",
+            YELLOW, "[WARNING] \t",
+            RED, "Failed to fetch the next page of posts (network error)"
+        )
+        return None
+
+    if response.status_code != 200:
+        error_handler(response)
+        return None
+
+    try:
+        return response.json()["data"]["user"]["edge_owner_to_timeline_media"]
+    except (ValueError, KeyError, TypeError):
+        colorPrint(
+            CYAN, f"[{time()}] \t",
+            RED, f"[{response.status_code}] \t\t\b",
+            YELLOW, "[WARNING] \t",
+            RED, "Failed to fetch the next page of posts"
+        )
+        return None
 
 
             # for collaborator_item in post_data["edge_media_to_tagged_user"]["edges"]:
@@ -0,0 +1,109 @@
+"""
+Copyright (c) 2025 obitouka
+See the file 'LICENSE' for copying permission
+"""
+
+import statistics
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from time import perf_counter
+from core.accountDataFetcher import fetch_profile, iter_posts, HEADERS
+from utils.colorPrinter import *
+from datetime import datetime
+
+
+WORKERS = 8     # concurrent profile lookups; the shared rate limiter still paces the requests
+
+
+def createSession(poolSize=WORKERS):
+    # One keep-alive connection per worker thread, reused for every profile and timeline page
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=poolSize)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+def fetchUser(username, session=None, maxPosts=None, since=None):
+    # One username's post URLs; None instead of a list when the profile couldn't be fetched
+    start = perf_counter()
+    userData = fetch_profile(username, session)
+    posts = None if userData is None else list(iter_posts(userData, maxPosts, since, session))
+    return username, posts, perf_counter() - start
+
+
+def fetchUsers(usernames, workers=WORKERS, maxPosts=None, since=None, session=None, pooled=True):
+    # Discovers posts for many usernames at once; returns ({username: posts or None}, stats)
+    usernames = list(dict.fromkeys(usernames))
+    ownSession = pooled and session is None
+    if ownSession:
+        session = createSession(workers)
+
+    results = {}
+    durations = []
+    start = perf_counter()
+
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {pool.submit(fetchUser, username, session, maxPosts, since): username
+                       for username in usernames}
+
+            for future in as_completed(futures):
+                error = None
+                try:
+                    username, posts, seconds = future.result()
+                    durations.append(seconds)
+                except Exception as e:
+                    # One user's failure is that user's result; the others keep theirs
+                    username, posts, seconds = futures[future], None, 0.0
+                    error = f"{type(e).__name__}: {e}"
+                results[username] = posts
+
+                colorPrint(
+                    CYAN, f"[{time()}] \t",
+                    GREEN if posts is not None else RED, "[USER]  \t\b",
+                    LIGHT_YELLOW_EX, f"{username}: ",
+                    LIGHT_BLUE_EX, f"{len(posts)} posts" if posts is not None else f"failed ({error or 'no profile'})",
+                    LIGHT_YELLOW_EX, f" ({seconds:.2f}s) [{len(results)}/{len(usernames)}]"
+                )
+    finally:
+        if ownSession:
+            session.close()
+
+    wall = perf_counter() - start
+    stats = {
+        "users": len(usernames),
+        "failed": sum(1 for posts in results.values() if posts is None),
+        "posts": sum(len(posts) for posts in results.values() if posts),
+        "workers": workers,
+        "pooled": session is not None,
+        "wallSeconds": wall,
+        "usersPerSecond": len(usernames) / wall if wall else 0.0,
+        "medianUserSeconds": statistics.median(durations) if durations else 0.0,
+        "maxUserSeconds": max(durations, default=0.0),
+    }
+    return results, stats
+
+
+def printStats(stats):
+    colorPrint(
+        CYAN, f"[{time()}] \t",
+        GREEN, "[DONE]  \t\b",
+        LIGHT_YELLOW_EX,
+        f"{stats['users'] - stats['failed']}/{stats['users']} users, {stats['posts']} posts in "
+        f"{stats['wallSeconds']:.2f}s ({stats['usersPerSecond']:.1f} users/s, "
+        f"median {stats['medianUserSeconds']:.2f}s per user, {stats['workers']} workers, "
+        f"{'pooled session' if stats['pooled'] else 'no session'})"
+    )
+
+
+def readUsernames(path):
+    # One username per line; blank lines, # comments and leading @ are ignored
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip().lstrip("@") for line in f if line.strip() and not line.startswith("#")]
+
+
+def time():
+    return datetime.now().strftime("%H:%M:%S")
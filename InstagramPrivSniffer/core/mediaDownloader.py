@@ -3,17 +3,54 @@ Copyright (c) 2025 obitouka
 See the file 'LICENSE' for copying permission
 """
 
+import os
+import re
 import requests
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from time import perf_counter
+from core.accountDataFetcher import fetch_profile, find_post, find_posts, iter_timeline, account_type, BASE_URL
+from core.bulkFetcher import createSession
 from utils.colorPrinter import *
 from datetime import datetime
 
-is_video = None
-media_url = None
-file_name = None
 time = datetime.now().strftime("%H:%M:%S")
 
-def fetch_media(url):
-    global is_video, media_url, file_name
+DOWNLOAD_DIR = "InstaDownloads"
+CHUNK_SIZE = 256 * 1024         # bytes held in memory at a time while downloading
+TIMEOUT = 30                    # seconds to connect / between received chunks
+WORKERS = 4                     # parallel downloads in bulk mode
+CONTENT_RANGE_PATTERN = re.compile(r"bytes (\d+)-\d+/(\d+|\*)")
+
+def fetch_media(url, session=None):
+    # Resolves a post URL to {"is_video", "media_url", "file_name", "shortcode"}; None if it can't be resolved
+    parsed = parse_post_url(url)
+    if parsed is None:
+        return None
+    user_name, shortcode, file_name = parsed
+
+    colorPrint(
+        CYAN, f"[{time()}] \t",
+        GREEN, "[INFO] \t\t", 
+        LIGHT_YELLOW_EX, "Fetching..."
+    )
+    
+    # Profile comes from the shared cache when the fetcher (or a previous download) just loaded it
+    node = find_post(user_name, shortcode, session)
+
+    if node is None:
+        colorPrint(
+            CYAN, f"[{time()}] \t",
+            YELLOW, "[WARNING] \t",
+            RED, "Failed to fetch media data"
+        )
+        return None
+
+    return media_from_node(node, file_name)
+
+
+def parse_post_url(url):
+    # (username, shortcode, file name) of a post URL; None (after printing the expected format) if it isn't one
     parts = url.split("/")
     
     if len(parts) < 6 or parts[4] not in ("p", "reel"):
@@ -31,57 +68,33 @@ def fetch_media(url):
                                 https://www.instagram.com/keyloggerluvr/reel/V2tgdUTWI6kLka3N/\n
             '''
         )
-        exit()
+        return None
 
     user_name = parts[3]
     shortcode = parts[5]
     file_name = f"{user_name}-{'reel' if parts[4] == 'reel' else 'post'}-{shortcode.replace('-', '')[:10]}{'.mp4' if parts[4] == 'reel' else '.png'}"
-    
-    colorPrint(
-        CYAN, f"[{time()}] \t",
-        GREEN, "[INFO] \t\t", 
-        LIGHT_YELLOW_EX, "Fetching..."
-    )
-    
-    r = requests.get(
-        f"https://www.instagram.com/api/v1/users/web_profile_info/?username={user_name}",
-        headers={
-            "X-IG-App-ID": "936619743392459"
-        }
-    )
+    return user_name, shortcode, file_name
 
-    try:
-        edges = r.json()["data"]["user"]["edge_owner_to_timeline_media"]["edges"]
-        for edge in edges:
-            node = edge["node"]
-            if node["shortcode"] == shortcode:
-                if node["is_video"]:
-                    is_video = True
-                    media_url = node["video_url"]
-                else:
-                    is_video = False
-                    media_url = node["display_url"]
-                break
-    except:
-        colorPrint(
-            CYAN, f"[{time()}] \t",
-            RED, f"[{r.status_code}] \t\t",
-            YELLOW, "[WARNING] \t",
-            RED, "Failed to fetch media data"
-        )
+
+def media_from_node(node, file_name):
+    return {
+        "is_video": node["is_video"],
+        "media_url": node["video_url"] if node["is_video"] else node["display_url"],
+        "file_name": file_name,
+        "shortcode": node["shortcode"],
+    }
 
 
 def download_media(post_url):
-    global is_video, media_url, file_name
-    fetch_media(post_url)
+    media = fetch_media(post_url)
 
-    if not media_url:
+    if not media or not media["media_url"]:
         colorPrint(
             CYAN, f"[{time()}] \t",
             RED, "[ERROR] \t",
             RED, "Invalid URL"
         )
-        return
+        return False
 
     colorPrint(
         CYAN, f"[{time()}] \t",
@@ -89,31 +102,180 @@ def download_media(post_url):
         LIGHT_YELLOW_EX, "Downloading..."
     )
 
-    r = requests.get(
-        media_url, 
-        headers={
-            "X-IG-App-ID": "936619743392459"
-        }
-    )
-
-    if r.status_code == 200:
-        with open(f"InstaDownloads\\{file_name}", "wb") as f:
-            f.write(r.content)
+    file_name = media["file_name"]
+    status = stream_download(media["media_url"], os.path.join(DOWNLOAD_DIR, file_name))
 
+    if status is True:
         colorPrint(
             CYAN, f"[{time()}] \t",
             GREEN, "[SUCCESS] \t",
             LIGHT_YELLOW_EX, "Downloaded ",
             LIGHT_BLUE_EX, ITALIC, f"{file_name} ", ITALIC_OFF,
-            LIGHT_YELLOW_EX, f"at {ITALIC}'InstaDownloads'{ITALIC_OFF} folder"
+            LIGHT_YELLOW_EX, f"at {ITALIC}'{DOWNLOAD_DIR}'{ITALIC_OFF} folder"
         )
     else:
         colorPrint(
             CYAN, f"[{time()}] \t",
-            RED, f"[{r.status_code}] \t\t\b",
+            RED, f"[{status}] \t\t\b",
             YELLOW, "[WARNING] \t",
-            RED, "Failed to download media"
+            RED, "Failed to download media (run again to resume)"
         )
+    return status is True
+
+
+def download_many(postUrls=None, username=None, workers=WORKERS):
+    # Bulk download: every post of username (or the given post URLs), resolved from one profile
+    # fetch and one timeline walk per account, then downloaded in parallel. Returns one result dict per post
+    session = createSession(workers)
+    try:
+        nodes = {}
+        if username:
+            userData = fetch_profile(username, session)
+            if userData is not None:
+                account_type(userData)
+                nodes = {node["shortcode"]: node for node in iter_timeline(userData, session)}
+            postUrls = [f"{BASE_URL}/{node['owner']['username']}/{'reel' if node['is_video'] else 'p'}/{shortcode}"
+                        for shortcode, node in nodes.items()]
+        postUrls = list(dict.fromkeys(postUrls or []))
+        parsed = {postUrl: parse_post_url(postUrl) for postUrl in postUrls}
+
+        if not username:
+            shortcodesByUser = {}
+            for item in filter(None, parsed.values()):
+                shortcodesByUser.setdefault(item[0], []).append(item[1])
+            for user, shortcodes in shortcodesByUser.items():
+                nodes.update(find_posts(user, shortcodes, session))
+
+        results = []
+        for postUrl in postUrls:
+            item = parsed[postUrl]
+            node = nodes.get(item[1]) if item is not None else None
+            media = media_from_node(node, item[2]) if node is not None else None
+            results.append(dict(media or {}, post_url=postUrl, status="unresolved" if not media else None))
+
+        pending = [result for result in results if result["status"] is None]
+
+        # File names keep 10 shortcode characters; spell out the whole shortcode where two posts would share one
+        names = Counter(result["file_name"] for result in pending)
+        for result in pending:
+            if names[result["file_name"]] > 1:
+                stem, ext = os.path.splitext(result["file_name"])
+                result["file_name"] = f"{stem}{result['shortcode'].replace('-', '')[10:]}{ext}"
+
+        colorPrint(
+            CYAN, f"[{time()}] \t",
+            GREEN, "[INFO] \t\t",
+            LIGHT_YELLOW_EX, f"Downloading {len(pending)} of {len(results)} posts with {workers} workers..."
+        )
+
+        start = perf_counter()
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = {pool.submit(timed_download, result["media_url"], result["file_name"], session): result
+                       for result in pending}
+
+            for future in as_completed(futures):
+                result = futures[future]
+                try:
+                    status, size, seconds = future.result()
+                except OSError as e:
+                    # Disk errors (full disk, permissions) fail this file only; the rest and the summary go on
+                    status, size, seconds = f"{type(e).__name__}: {e.strerror or e}", 0, 0.0
+                result.update(status=status, bytes=size, seconds=seconds)
+                colorPrint(
+                    CYAN, f"[{time()}] \t",
+                    GREEN if status is True else RED, "[FILE]  \t\b",
+                    LIGHT_BLUE_EX, f"{result['file_name']} ",
+                    LIGHT_YELLOW_EX,
+                    f"{size / 1048576:.1f} MB in {seconds:.2f}s ({size / 1048576 / seconds if seconds else 0:.1f} MB/s)"
+                    if status is True else f"failed [{status}]"
+                )
+        wall = perf_counter() - start
+    finally:
+        session.close()
+
+    done = [result for result in results if result["status"] is True]
+    totalBytes = sum(result["bytes"] for result in done)
+    colorPrint(
+        CYAN, f"[{time()}] \t",
+        GREEN, "[DONE]  \t\b",
+        LIGHT_YELLOW_EX,
+        f"{len(done)}/{len(results)} files, {totalBytes / 1048576:.1f} MB in {wall:.2f}s "
+        f"({totalBytes / 1048576 / wall if wall else 0:.1f} MB/s aggregate) at {ITALIC}'{DOWNLOAD_DIR}'{ITALIC_OFF}"
+    )
+    return results
+
+
+def timed_download(mediaUrl, fileName, session=None):
+    # stream_download plus (status, bytes on disk, seconds) for the bulk report
+    path = os.path.join(DOWNLOAD_DIR, fileName)
+    start = perf_counter()
+    status = stream_download(mediaUrl, path, session)
+    size = os.path.getsize(path) if status is True else 0
+    return status, size, perf_counter() - start
+
+
+def stream_download(url, path, session=None, chunkSize=CHUNK_SIZE):
+    # Streams url into path.part one chunk at a time and renames it to path once complete.
+    # A .part left by an interrupted run is resumed with a Range request.
+    # Returns True when done, otherwise the HTTP status (or "---" for a network error)
+    partPath = f"{path}.part"
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    for _ in range(2):
+        offset = os.path.getsize(partPath) if os.path.exists(partPath) else 0
+        headers = {"X-IG-App-ID": "936619743392459"}
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+
+        try:
+            with (session or requests).get(url, headers=headers, stream=True, timeout=TIMEOUT) as r:
+                if r.status_code == 416:
+                    # Nothing left past offset: either the .part is already complete or it is stale
+                    match = re.search(r"/(\d+)", r.headers.get("Content-Range", ""))
+                    if match and int(match.group(1)) == offset:
+                        os.replace(partPath, path)
+                        return True
+                    os.remove(partPath)
+                    continue
+
+                if r.status_code == 206:
+                    match = CONTENT_RANGE_PATTERN.match(r.headers.get("Content-Range", ""))
+                    if not match or int(match.group(1)) != offset:
+                        # Server answered a different range than asked for; start over
+                        os.remove(partPath)
+                        continue
+                    total = int(match.group(2)) if match.group(2) != "*" else None
+                    mode = "ab"
+                elif r.status_code == 200:
+                    # No Range support (or no partial file): the body is the whole file
+                    total = int(r.headers["Content-Length"]) if "Content-Length" in r.headers else None
+                    offset, mode = 0, "wb"
+                else:
+                    return r.status_code
+
+                if offset:
+                    colorPrint(
+                        CYAN, f"[{time()}] \t",
+                        GREEN, "[RESUME] \t",
+                        LIGHT_YELLOW_EX, f"Continuing at {offset / 1048576:.1f} MB"
+                        + (f" of {total / 1048576:.1f} MB" if total else "")
+                    )
+
+                with open(partPath, mode) as f:
+                    for chunk in r.iter_content(chunk_size=chunkSize):
+                        f.write(chunk)
+
+        except requests.RequestException:
+            # Whatever reached disk stays in the .part for the next attempt
+            return "---"
+
+        if total is not None and os.path.getsize(partPath) != total:
+            return "---"
+
+        os.replace(partPath, path)
+        return True
+
+    return "---"
 
 def time():
     return datetime.now().strftime("%H:%M:%S")
\ No newline at end of file
@@ -0,0 +1,127 @@
+"""
+Copyright (c) 2025 obitouka
+See the file 'LICENSE' for copying permission
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import threading
+from time import time as epoch
+
+
+# web_profile_info user objects (plus any timeline pages fetched after them), one gzip file per username,
+# stored as {"fetchedAt": <epoch of the web_profile_info request>, "user": <user object>}
+CACHE_DIR = os.environ.get(
+    "IG_PROFILE_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "profileCache")
+)
+
+TTL = float(os.environ.get("IG_PROFILE_CACHE_TTL", 900))                        # seconds, 0 disables the cache
+MAX_BYTES = int(os.environ.get("IG_PROFILE_CACHE_MAX_BYTES", 50 * 1024 * 1024)) # oldest entries evicted past this
+
+# Server the profiles came from (the same IG_BASE_URL accountDataFetcher uses); part of every key,
+# so profiles served by mock_server.py are never handed to a run against instagram.com
+SOURCE = os.environ.get("IG_BASE_URL", "https://www.instagram.com").rstrip("/")
+
+lock = threading.Lock()
+
+
+def cachePath(username):
+    source = hashlib.sha1(SOURCE.encode("utf-8")).hexdigest()[:10]
+    return os.path.join(CACHE_DIR, f"{username.lower()}-{source}.json.gz")
+
+
+def getProfile(username):
+    # Cached user object, None when missing, expired or unreadable
+    entry = readEntry(username)
+    return entry["user"] if entry else None
+
+
+def readEntry(username):
+    # The TTL runs from when the profile itself was fetched; appending timeline pages
+    # rewrites the file (and its mtime) but doesn't make the profile fields any fresher
+    if TTL <= 0:
+        return None
+
+    try:
+        with gzip.open(cachePath(username), "rt", encoding="utf-8") as f:
+            entry = json.load(f)
+        if epoch() - entry["fetchedAt"] > TTL:
+            return None
+        return entry
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def putProfile(username, userData, fetchedAt=None):
+    # fetchedAt defaults to now: a freshly fetched profile
+    if TTL <= 0:
+        return
+
+    path = cachePath(username)
+    tmpPath = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    entry = {"fetchedAt": epoch() if fetchedAt is None else fetchedAt, "user": userData}
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with gzip.open(tmpPath, "wt", encoding="utf-8") as f:
+            json.dump(entry, f, separators=(",", ":"))
+        os.replace(tmpPath, path)
+    except OSError:
+        return
+
+    evict()
+
+
+def extendTimeline(username, userData, timeline):
+    # Appends a freshly fetched timeline page to the cached user object, so the next reader
+    # continues from the new end_cursor instead of paging from the start again
+    if TTL <= 0:
+        return userData
+
+    with lock:
+        entry = readEntry(username)
+        if entry is None:
+            # Expired or gone: nothing to extend, the caller keeps paging from its own copy
+            return userData
+        cached = entry["user"]
+        media = cached["edge_owner_to_timeline_media"]
+        known = {edge["node"]["shortcode"] for edge in media["edges"]}
+        media["edges"].extend(edge for edge in timeline["edges"] if edge["node"]["shortcode"] not in known)
+        media["page_info"] = timeline.get("page_info") or {}
+        putProfile(username, cached, entry["fetchedAt"])
+        return cached
+
+
+def evict():
+    # Drops expired entries, then the oldest ones until the cache fits in MAX_BYTES
+    try:
+        entries = []
+        for name in os.listdir(CACHE_DIR):
+            if name.endswith(".json.gz"):
+                path = os.path.join(CACHE_DIR, name)
+                stat = os.stat(path)
+                entries.append((stat.st_mtime, stat.st_size, path))
+    except OSError:
+        return
+
+    now = epoch()
+    total = sum(size for _, size, _ in entries)
+    for mtime, size, path in sorted(entries):
+        if now - mtime <= TTL and total <= MAX_BYTES:
+            break
+        try:
+            os.remove(path)
+            total -= size
+        except OSError:
+            pass
+
+
+def clear():
+    try:
+        for name in os.listdir(CACHE_DIR):
+            if name.endswith(".json.gz"):
+                os.remove(os.path.join(CACHE_DIR, name))
+    except OSError:
+        pass
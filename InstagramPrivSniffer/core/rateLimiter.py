@@ -0,0 +1,164 @@
+"""
+Copyright (c) 2025 obitouka
+See the file 'LICENSE' for copying permission
+"""
+
+import os
+import random
+import sqlite3
+import requests
+from time import sleep, time as epoch
+from utils.colorPrinter import *
+from datetime import datetime
+
+
+# One bucket shared by every process on the machine (sniffer runs, parallel workers)
+DB_PATH = os.environ.get(
+    "IG_RATE_LIMIT_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rateLimit.db")
+)
+
+REQUESTS_PER_MINUTE = float(os.environ.get("IG_REQUESTS_PER_MINUTE", 12))
+BURST = 3                       # requests allowed back to back after an idle period
+MIN_REQUESTS_PER_MINUTE = 1.0   # adaptive rate never drops below this
+RECOVERY_FACTOR = 1.05          # rate growth per successful request, up to REQUESTS_PER_MINUTE
+THROTTLE_FACTOR = 0.5           # rate cut on every 401/429
+BACKOFF_BASE = 30.0             # seconds, doubled per consecutive throttle
+BACKOFF_MAX = 600.0
+MAX_RETRIES = 4
+THROTTLE_CODES = (401, 429)
+TIMEOUT = 30                    # seconds per request (connect and each read)
+NETWORK_BACKOFF_BASE = 5.0      # seconds, doubled per consecutive dropped or timed out request
+NETWORK_ERRORS = (requests.ConnectionError, requests.Timeout)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bucket (
+    name TEXT PRIMARY KEY,
+    tokens REAL NOT NULL,
+    rate REAL NOT NULL,
+    updated REAL NOT NULL,
+    blockedUntil REAL NOT NULL DEFAULT 0,
+    strikes INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+def connect(name="instagram"):
+    conn = sqlite3.connect(DB_PATH, timeout=60, isolation_level=None)
+    conn.execute(SCHEMA)
+    conn.execute(
+        "INSERT OR IGNORE INTO bucket (name, tokens, rate, updated) VALUES (?, ?, ?, ?)",
+        (name, BURST, REQUESTS_PER_MINUTE / 60, epoch())
+    )
+    return conn
+
+
+def acquire(name="instagram"):
+    # Blocks until the shared bucket hands out a token; returns seconds waited
+    conn = connect(name)
+    waited = 0.0
+
+    try:
+        while True:
+            conn.execute("BEGIN IMMEDIATE")
+            tokens, rate, updated, blockedUntil = conn.execute(
+                "SELECT tokens, rate, updated, blockedUntil FROM bucket WHERE name = ?", (name,)
+            ).fetchone()
+
+            now = epoch()
+            tokens = min(BURST, tokens + (now - updated) * rate)
+
+            if now < blockedUntil:
+                wait = blockedUntil - now
+            elif tokens >= 1:
+                conn.execute("UPDATE bucket SET tokens = ?, updated = ? WHERE name = ?", (tokens - 1, now, name))
+                conn.execute("COMMIT")
+                return waited
+            else:
+                wait = (1 - tokens) / rate
+
+            conn.execute("UPDATE bucket SET tokens = ?, updated = ? WHERE name = ?", (tokens, now, name))
+            conn.execute("COMMIT")
+
+            # Jitter so waiting workers don't all wake on the same instant
+            wait += random.uniform(0, min(1.0, wait * 0.1))
+            sleep(wait)
+            waited += wait
+    finally:
+        conn.close()
+
+
+def reportThrottle(name="instagram"):
+    # Pauses every process sharing the bucket and slows the rate; returns the pause in seconds
+    conn = connect(name)
+
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        rate, strikes = conn.execute(
+            "SELECT rate, strikes FROM bucket WHERE name = ?", (name,)
+        ).fetchone()
+
+        pause = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** strikes) * random.uniform(0.75, 1.25)
+        rate = max(MIN_REQUESTS_PER_MINUTE / 60, rate * THROTTLE_FACTOR)
+        conn.execute(
+            "UPDATE bucket SET rate = ?, strikes = ?, tokens = 0, updated = ?, "
+            "blockedUntil = MAX(blockedUntil, ?) WHERE name = ?",
+            (rate, strikes + 1, epoch(), epoch() + pause, name)
+        )
+        conn.execute("COMMIT")
+    finally:
+        conn.close()
+
+    colorPrint(
+        CYAN, f"[{time()}] \t",
+        YELLOW, "[BACKOFF] \t",
+        LIGHT_YELLOW_EX, f"Rate limited, pausing {pause:.0f}s and slowing to {rate * 60:.1f} requests/min"
+    )
+    return pause
+
+
+def reportSuccess(name="instagram"):
+    conn = connect(name)
+
+    try:
+        conn.execute(
+            "UPDATE bucket SET strikes = 0, rate = MIN(?, rate * ?) WHERE name = ?",
+            (REQUESTS_PER_MINUTE / 60, RECOVERY_FACTOR, name)
+        )
+    finally:
+        conn.close()
+
+
+def rateLimitedGet(url, maxRetries=MAX_RETRIES, session=None, **kwargs):
+    # requests.get paced by the shared bucket, retried with backoff on 401/429 and on dropped
+    # or timed out connections (re-raised once retries run out); pass a requests.Session to
+    # reuse its keep-alive connections
+    kwargs.setdefault("timeout", TIMEOUT)
+    for attempt in range(maxRetries + 1):
+        acquire()
+        try:
+            response = (session or requests).get(url, **kwargs)
+        except NETWORK_ERRORS as e:
+            if attempt == maxRetries:
+                raise
+            pause = min(BACKOFF_MAX, NETWORK_BACKOFF_BASE * 2 ** attempt) * random.uniform(0.75, 1.25)
+            colorPrint(
+                CYAN, f"[{time()}] \t",
+                YELLOW, "[BACKOFF] \t",
+                LIGHT_YELLOW_EX, f"{type(e).__name__}, retrying in {pause:.0f}s"
+            )
+            sleep(pause)
+            continue
+
+        if response.status_code not in THROTTLE_CODES:
+            reportSuccess()
+            return response
+
+        # Recorded even on the last attempt so other workers slow down too
+        reportThrottle()
+
+    return response
+
+
+def time():
+    return datetime.now().strftime("%H:%M:%S")
@@ -3,8 +3,10 @@ Copyright (c) 2025 obitouka
 See the file 'LICENSE' for copying permission
 """
 
+import os
 from core.accountDataFetcher import fetch_data 
-from core.mediaDownloader import download_media
+from core.bulkFetcher import fetchUsers, printStats, readUsernames, WORKERS
+from core.mediaDownloader import download_media, download_many, WORKERS as DOWNLOAD_WORKERS
 from lib.banner import printBanner
 from utils.parser import getArguments
 
@@ -12,10 +14,24 @@ def main(args):
 
     if args.name:
         # printBanner()
-        return fetch_data(args.name)
+        return fetch_data(args.name, getattr(args, "max_posts", None), getattr(args, "since", None))
+    elif getattr(args, "file", None):
+        results, stats = fetchUsers(
+            readUsernames(args.file), getattr(args, "workers", None) or WORKERS,
+            getattr(args, "max_posts", None), getattr(args, "since", None)
+        )
+        printStats(stats)
+        return results
     elif args.dload:
         # printBanner()
         return download_media(args.dload)
+    elif getattr(args, "dload_all", None):
+        workers = getattr(args, "workers", None) or DOWNLOAD_WORKERS
+        if os.path.isfile(args.dload_all):
+            with open(args.dload_all, "r", encoding="utf-8") as f:
+                postUrls = [line.strip() for line in f if line.strip() and not line.startswith("#")]
+            return download_many(postUrls, workers=workers)
+        return download_many(username=args.dload_all.lstrip("@"), workers=workers)
     
 
 if __name__ == "__main__":
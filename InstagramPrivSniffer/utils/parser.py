@@ -3,9 +3,16 @@ Copyright (c) 2025 obitouka
 See the file 'LICENSE' for copying permission 
 """
 
-from argparse import ArgumentParser
+from argparse import ArgumentParser, ArgumentTypeError
+from datetime import datetime
 from lib.version import __version__
 
+def sinceDate(value):
+    try:
+        return datetime.strptime(value, "%Y-%m-%d")
+    except ValueError:
+        raise ArgumentTypeError(f"expected YYYY-MM-DD, got {value!r}")
+
 def getArguments(): 
     parser = ArgumentParser(
             prog='InstagramPrivSniffer ',
@@ -20,6 +27,34 @@ def getArguments():
         type=str
     )
 
+    parser.add_argument(
+        "-f", "--file",
+        metavar="USERNAMES_FILE",
+        help="Fetch post links for every username in the file (one per line), concurrently", 
+        type=str
+    )
+
+    parser.add_argument(
+        "-w", "--workers",
+        metavar="N",
+        help="Concurrent profile lookups with -f / downloads with -D (default: 8 / 4)", 
+        type=int
+    )
+
+    parser.add_argument(
+        "--max-posts",
+        metavar="N",
+        help="Stop after the N newest posts (with -n or -f)", 
+        type=int
+    )
+
+    parser.add_argument(
+        "--since",
+        metavar="YYYY-MM-DD",
+        help="Only list posts from this date on (with -n or -f)", 
+        type=sinceDate
+    )
+
     parser.add_argument(
         "-d", "--dload",
         metavar="POSTURL",
@@ -27,6 +62,13 @@ def getArguments():
         type=str
     )
 
+    parser.add_argument(
+        "-D", "--dload-all",
+        metavar="USERNAME_OR_FILE",
+        help="Download every post of a user, or every post URL in a file (one per line), in parallel", 
+        type=str
+    )
+
     parser.add_argument(
         "--version", 
         help="version of this tool", 
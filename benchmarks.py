@@ -0,0 +1,339 @@
+"""
+Benchmarks
+Offline measurements for scraper internals, run against the CSV outputs already in the repo.
+
+Usage:
+    python benchmarks.py <dedup|validate>
+    python benchmarks.py profile [post_url] [--loads=3] [--headed]
+    python benchmarks.py discovery [--users=40] [--posts=36] [--latency=0.05] [--workers=8]
+    python benchmarks.py download [--size-mb=64]
+
+profile launches Firefox with the default and the lean profile and loads post_url (a local
+mock_server.py post when omitted; a real reel shows the difference best). Firefox RSS needs psutil.
+discovery runs InstagramPrivSniffer's bulk profile lookups against a local mock web_profile_info server.
+download compares buffered and streamed media downloads from the mock server's /media/ files.
+"""
+
+import csv
+import glob
+import os
+import re
+import sys
+import time
+import tracemalloc
+
+from text_validator import create_comment_key, is_valid_text, DEFAULT_VALIDATOR, FOOTER_TERMS
+
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_GLOBS = ["*.csv", "yes/*.csv", "prototypes/*.csv"]
+
+
+def load_comment_corpus(patterns=CORPUS_GLOBS):
+    """
+    Load (username, comment) pairs from the scraper's CSV outputs
+
+    Args:
+        patterns (list): Glob patterns relative to the repo directory
+
+    Returns:
+        list: (username, comment) tuples
+    """
+    pairs = []
+    for pattern in patterns:
+        for path in sorted(glob.glob(os.path.join(REPO_DIR, pattern))):
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                in_comments = False
+                for row in csv.reader(f):
+                    if row[:2] == ['Username', 'Comment']:
+                        in_comments = True
+                    elif in_comments and len(row) >= 2:
+                        pairs.append((row[0], row[1]))
+    return pairs
+
+
+def legacy_comment_key(username, comment, max_length=50):
+    """Previous dedup key: username plus the first 50 characters of the comment"""
+    return f"{username}:{comment[:max_length]}"
+
+
+def _measure_key_scheme(pairs, key_func, repeats):
+    """
+    Build a dedup set with key_func and measure time and memory
+
+    Args:
+        pairs (list): (username, comment) tuples
+        key_func (callable): Key function
+        repeats (int): Timing repetitions (best one is reported)
+
+    Returns:
+        tuple: (seconds, peak_bytes, unique_keys)
+    """
+    best = None
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        keys = set()
+        for username, comment in pairs:
+            key = key_func(username, comment)
+            if key not in keys:
+                keys.add(key)
+        elapsed = time.perf_counter() - start_time
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    keys = {key_func(username, comment) for username, comment in pairs}
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, len(keys)
+
+
+def benchmark_dedup(repeats=5):
+    """
+    Compare the legacy string keys with the 64-bit digest keys on the CSV corpus
+
+    Args:
+        repeats (int): Timing repetitions per scheme
+    """
+    pairs = load_comment_corpus()
+    distinct_pairs = len(set(pairs))
+    print(f"Corpus: {len(pairs)} comment rows, {distinct_pairs} distinct (username, comment) pairs")
+
+    for name, key_func in (("legacy username:comment[:50]", legacy_comment_key),
+                           ("blake2b 64-bit digest", create_comment_key)):
+        elapsed, peak, unique = _measure_key_scheme(pairs, key_func, repeats)
+        merged = distinct_pairs - unique
+        print(f"  {name:<30} {elapsed * 1000:8.2f} ms  "
+              f"{elapsed / max(len(pairs), 1) * 1e6:6.2f} us/row  "
+              f"peak {peak / 1024:8.1f} KiB  {unique} keys  {merged} distinct comments merged")
+
+
+# Texts found next to comments in the DOM that validation has to reject
+NOISE_SPANS = ["3h", "2w", "1d", "12 likes", "1 like", "Reply", "View replies", "Follow", "Like", "Meta", "5mo"]
+
+
+def legacy_is_valid_text(text, min_length=1):
+    """Previous is_valid_text: two uncompiled re.match calls per text"""
+    if not text or len(text) < min_length:
+        return False
+    if text in FOOTER_TERMS:
+        return False
+    if re.match(r'^\d+\s*(h|m|d|w|s|mo|y|ago|like|likes)$', text, re.IGNORECASE):
+        return False
+    if re.match(r'^(Reply|View|Follow|Following|Like|Unlike)$', text, re.IGNORECASE):
+        return False
+    return True
+
+
+def benchmark_validate(repeats=5):
+    """
+    Compare per-span validation cost: legacy function, compiled function, validate_many
+
+    Args:
+        repeats (int): Timing repetitions per variant (best one is reported)
+    """
+    spans = []
+    for username, comment in load_comment_corpus():
+        spans.extend((username, comment))
+        spans.append(NOISE_SPANS[len(spans) % len(NOISE_SPANS)])
+    print(f"Corpus: {len(spans)} spans (usernames, comments and interleaved noise)")
+
+    variants = (
+        ("legacy is_valid_text", lambda: [legacy_is_valid_text(text) for text in spans]),
+        ("compiled is_valid_text", lambda: [is_valid_text(text) for text in spans]),
+        ("TextValidator.validate_many", lambda: DEFAULT_VALIDATOR.validate_many(spans)),
+    )
+    expected = variants[0][1]()
+    for name, run in variants:
+        best = None
+        for _ in range(repeats):
+            start_time = time.perf_counter()
+            mask = run()
+            elapsed = time.perf_counter() - start_time
+            best = elapsed if best is None else min(best, elapsed)
+        agrees = "same result" if mask == expected else "RESULT DIFFERS"
+        print(f"  {name:<30} {best * 1000:8.2f} ms  {best / len(spans) * 1e9:7.0f} ns/span  {agrees}")
+
+
+# Bytes over the wire for the page and everything it pulled in (cached entries report 0)
+TRANSFER_SIZE_SCRIPT = """
+return performance.getEntriesByType('navigation').concat(performance.getEntriesByType('resource'))
+    .reduce((total, entry) => total + (entry.transferSize || 0), 0);
+"""
+
+
+def firefox_rss(driver):
+    """
+    Resident memory of the Firefox parent process and its content processes
+
+    Args:
+        driver: Selenium WebDriver instance
+
+    Returns:
+        int or None: RSS in bytes, None if psutil is missing or the process can't be read
+    """
+    try:
+        import psutil
+    except ImportError:
+        return None
+
+    pid = driver.capabilities.get("moz:processID")
+    if not pid:
+        return None
+    try:
+        parent = psutil.Process(pid)
+        return sum(process.memory_info().rss for process in [parent] + parent.children(recursive=True))
+    except psutil.Error:
+        return None
+
+
+def benchmark_profile(post_url=None, loads=3, headless=True):
+    """
+    Compare page-load time, bytes transferred and Firefox RSS for the default and lean profiles
+
+    Args:
+        post_url (str, optional): Page to load (a mock_server.py post when omitted)
+        loads (int): Page loads per profile (fresh browser each time, so nothing comes from cache)
+        headless (bool): Run the browsers headless
+    """
+    from browser_setup import setup_browser, close_browser
+
+    server = None
+    if post_url is None:
+        from mock_server import start_mock_server
+        server, base_url = start_mock_server()
+        post_url = f"{base_url}/reel/MOCK0001/"
+    print(f"Loading {post_url} {loads}x per profile")
+
+    try:
+        for name, lean in (("default", False), ("lean", True)):
+            times, transferred, rss = [], [], []
+            for _ in range(loads):
+                driver, _ = setup_browser(headless=headless, lean=lean)
+                try:
+                    start_time = time.perf_counter()
+                    driver.get(post_url)
+                    times.append(time.perf_counter() - start_time)
+                    # Let lazy-loaded media and the video player settle before measuring
+                    time.sleep(3)
+                    transferred.append(driver.execute_script(TRANSFER_SIZE_SCRIPT) or 0)
+                    rss.append(firefox_rss(driver))
+                finally:
+                    close_browser(driver)
+
+            rss_text = (f"{max(rss) / 2**20:7.1f} MiB RSS" if None not in rss
+                        else "RSS n/a (pip install psutil)")
+            print(f"  {name:<8} load {min(times):6.2f}s best / {sum(times) / len(times):6.2f}s avg  "
+                  f"{sum(transferred) / len(transferred) / 1024:9.1f} KiB transferred  {rss_text}")
+    finally:
+        if server is not None:
+            server.shutdown()
+
+
+def benchmark_discovery(users=40, posts=36, latency=0.05, workers=8):
+    """
+    Compare sequential, pooled and concurrent post discovery against the mock profile endpoints
+
+    Args:
+        users (int): Usernames to look up
+        posts (int): Timeline posts per mock user (12 per page)
+        latency (float): Seconds of server delay per response
+        workers (int): Threads for the concurrent run
+    """
+    import contextlib
+    import io
+    import tempfile
+    from mock_server import start_mock_server
+
+    server, base_url = start_mock_server(latency=latency, total_posts=posts)
+    rate_dir = tempfile.mkdtemp()
+    # The sniffer reads these at import time: point it at the mock, keep the rate limiter out of the
+    # way and switch the profile cache off, so every phase really fetches (and nothing lands in profileCache/)
+    os.environ["IG_BASE_URL"] = base_url
+    os.environ["IG_RATE_LIMIT_DB"] = os.path.join(rate_dir, "rateLimit.db")
+    os.environ["IG_REQUESTS_PER_MINUTE"] = "1000000"
+    os.environ["IG_PROFILE_CACHE_TTL"] = "0"
+    os.environ["IG_PROFILE_CACHE_DIR"] = os.path.join(rate_dir, "profileCache")
+    sys.path.insert(0, os.path.join(REPO_DIR, "InstagramPrivSniffer"))
+    from core.bulkFetcher import fetchUsers
+
+    usernames = [f"mock_creator_{i}" for i in range(users)]
+    print(f"{users} users x {posts} posts, {latency * 1000:.0f} ms server latency")
+    try:
+        for name, run_workers, pooled in (("sequential, new connection each", 1, False),
+                                          ("sequential, pooled session", 1, True),
+                                          (f"{workers} threads, pooled session", workers, True)):
+            with contextlib.redirect_stdout(io.StringIO()):
+                results, stats = fetchUsers(usernames, run_workers, pooled=pooled)
+            print(f"  {name:<34} {stats['wallSeconds']:7.2f}s  {stats['usersPerSecond']:6.1f} users/s  "
+                  f"{stats['posts']} posts  {stats['failed']} failed")
+    finally:
+        server.shutdown()
+
+
+def benchmark_download(size_mb=64):
+    """
+    Compare time and peak Python memory of buffered (r.content) and streamed media downloads
+
+    Args:
+        size_mb (int): Size of the mock media file in MiB
+    """
+    import requests
+    import tempfile
+    from mock_server import start_mock_server
+
+    sys.path.insert(0, os.path.join(REPO_DIR, "InstagramPrivSniffer"))
+    from core.mediaDownloader import stream_download, CHUNK_SIZE
+
+    server, base_url = start_mock_server(media_size=size_mb * 1024 * 1024)
+    url = f"{base_url}/media/benchmark.mp4"
+    out_dir = tempfile.mkdtemp()
+
+    def buffered():
+        r = requests.get(url)
+        with open(os.path.join(out_dir, "buffered.mp4"), 'wb') as f:
+            f.write(r.content)
+
+    def streamed():
+        stream_download(url, os.path.join(out_dir, "streamed.mp4"))
+        os.remove(os.path.join(out_dir, "streamed.mp4"))
+
+    print(f"{size_mb} MiB file, {CHUNK_SIZE // 1024} KiB chunks")
+    try:
+        for name, run in (("buffered r.content", buffered), ("streamed to .part", streamed)):
+            tracemalloc.start()
+            start_time = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start_time
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"  {name:<20} {elapsed:6.2f}s  {size_mb / elapsed:7.1f} MiB/s  peak {peak / 2**20:8.2f} MiB")
+    finally:
+        server.shutdown()
+
+
+BENCHMARKS = {
+    "dedup": benchmark_dedup,
+    "validate": benchmark_validate,
+    "profile": benchmark_profile,
+    "discovery": benchmark_discovery,
+    "download": benchmark_download,
+}
+
+
+if __name__ == "__main__":
+    positional = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if not positional or positional[0] not in BENCHMARKS:
+        print(f"Usage: python benchmarks.py <{'|'.join(BENCHMARKS)}>")
+        sys.exit(1)
+
+    flags = dict(arg[2:].partition("=")[::2] for arg in sys.argv[1:] if arg.startswith("--"))
+    if positional[0] == "profile":
+        benchmark_profile(positional[1] if len(positional) > 1 else None,
+                          int(flags.get("loads") or 3), "headed" not in flags)
+    elif positional[0] == "discovery":
+        benchmark_discovery(int(flags.get("users") or 40), int(flags.get("posts") or 36),
+                            float(flags.get("latency") or 0.05), int(flags.get("workers") or 8))
+    elif positional[0] == "download":
+        benchmark_download(int(flags.get("size-mb") or 64))
+    else:
+        BENCHMARKS[positional[0]]()
@@ -7,12 +7,32 @@ from selenium import webdriver
 from selenium.webdriver.support.ui import WebDriverWait
 
 
-def setup_browser(headless=False):
+# Firefox prefs for comment scraping: nothing the comment DOM needs is an image,
+# a video or a web font, so none of them are fetched or decoded
+LEAN_PREFERENCES = {
+    "permissions.default.image": 2,              # block all images
+    "media.autoplay.default": 5,                 # block autoplay, audible and muted
+    "media.autoplay.blocking_policy": 2,
+    "media.mediasource.enabled": False,          # no MSE, so the reel player never streams segments
+    "media.mp4.enabled": False,
+    "media.webm.enabled": False,
+    "media.hardware-video-decoding.enabled": False,
+    "media.video_stats.enabled": False,
+    "gfx.downloadable_fonts.enabled": False,     # skip web font downloads
+    "browser.display.use_document_fonts": 0,
+    "network.prefetch-next": False,
+    "network.dns.disablePrefetch": True,
+    "network.http.speculative-parallel-limit": 0,
+}
+
+
+def setup_browser(headless=False, lean=False):
     """
     Setup Firefox browser with options
     
     Args:
         headless (bool): Whether to run in headless mode
+        lean (bool): Block images, media and fonts and return from page loads once the DOM is ready
         
     Returns:
         tuple: (driver, wait) - WebDriver instance and WebDriverWait instance
@@ -24,11 +44,17 @@ def setup_browser(headless=False):
     if headless:
         options.add_argument('--headless')
     
+    if lean:
+        for name, value in LEAN_PREFERENCES.items():
+            options.set_preference(name, value)
+        # driver.get returns at DOMContentLoaded instead of waiting for every subresource
+        options.page_load_strategy = "eager"
+    
     service = webdriver.FirefoxService()
     driver = webdriver.Firefox(service=service, options=options)
     wait = WebDriverWait(driver, 10)
     
-    print("Browser initialized successfully")
+    print(f"Browser initialized successfully{' (lean profile)' if lean else ''}")
     return driver, wait
 
 
@@ -0,0 +1,119 @@
+"""
+Checkpoint Module
+Saves a post's progress (comments, dedup keys, scroll position) while scrolling so a crashed run can resume.
+"""
+
+import hashlib
+import json
+import os
+import time
+
+from comment_batch import CommentBatch
+from comment_fetcher import shortcode_from_url
+
+
+CHECKPOINT_DIR = "checkpoints"
+CHECKPOINT_EVERY = 5  # scrolls
+
+
+def checkpoint_path(post_url, checkpoint_dir=CHECKPOINT_DIR):
+    """
+    Checkpoint file for a post (named after its shortcode)
+
+    Args:
+        post_url (str): Instagram post URL
+        checkpoint_dir (str): Directory holding checkpoints
+
+    Returns:
+        str: Path to the checkpoint file
+    """
+    name = shortcode_from_url(post_url) or hashlib.sha1(post_url.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(checkpoint_dir, f"{name}.json")
+
+
+class ScrapeCheckpoint:
+    """Progress of one post; the scroll loop updates the position, saves happen every few scrolls"""
+
+    def __init__(self, post_url, every=CHECKPOINT_EVERY, checkpoint_dir=CHECKPOINT_DIR):
+        """
+        Args:
+            post_url (str): Instagram post URL
+            every (int): Save every this many scrolls (0 disables periodic saves)
+            checkpoint_dir (str): Directory holding checkpoints
+        """
+        self.post_url = post_url
+        self.every = every
+        self.path = checkpoint_path(post_url, checkpoint_dir)
+        self.scroll_index = 0
+        self.scroll_height = 0
+
+    def update(self, scroll_index, scroll_height):
+        """
+        Record the scroll position reached
+
+        Args:
+            scroll_index (int): Scrolls completed
+            scroll_height (int): Container scrollHeight after that scroll
+        """
+        self.scroll_index = scroll_index
+        self.scroll_height = max(self.scroll_height, scroll_height or 0)
+
+    def due(self):
+        """
+        Returns:
+            bool: True if a periodic save is due at the current scroll
+        """
+        return bool(self.every) and self.scroll_index > 0 and self.scroll_index % self.every == 0
+
+    def save(self, batch, processed_comments):
+        """
+        Write the checkpoint (atomically, so a crash mid-write keeps the previous one)
+
+        Args:
+            batch (CommentBatch): All comments collected so far
+            processed_comments (set): Dedup keys collected so far
+        """
+        data = {
+            "post_url": self.post_url,
+            "saved_at": time.time(),
+            "scroll_index": self.scroll_index,
+            "scroll_height": self.scroll_height,
+            "processed_comments": list(processed_comments),
+            "comments": batch.to_dicts(),
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+            print(f"  💾 Checkpoint: {len(batch)} comments at scroll {self.scroll_index} -> {self.path}")
+        except Exception as e:
+            print(f"  Could not write checkpoint: {e}")
+
+    def load(self):
+        """
+        Read the saved checkpoint and restore the scroll position
+
+        Returns:
+            tuple or None: (CommentBatch, processed_comments set), None if there is no checkpoint
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        self.scroll_index = data.get("scroll_index", 0)
+        self.scroll_height = data.get("scroll_height", 0)
+        batch = CommentBatch.from_dicts(data.get("comments", []))
+        print(f"♻️  Loaded checkpoint: {len(batch)} comments, scroll {self.scroll_index}, "
+              f"height {self.scroll_height}px")
+        return batch, set(data.get("processed_comments", []))
+
+    def clear(self):
+        """Delete the checkpoint after the post finished"""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
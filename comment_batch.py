@@ -0,0 +1,152 @@
+"""
+Comment Batch Module
+Holds extracted comments as one record per comment instead of parallel username/comment/likes lists.
+"""
+
+import time
+
+
+class CommentRecord:
+    """A single extracted comment"""
+
+    __slots__ = ("username", "text", "likes", "scroll_index", "extracted_at", "comment_id", "reply_to", "created_at")
+
+    def __init__(self, username, text, likes=0, scroll_index=0, extracted_at=None, comment_id=None, reply_to=None,
+                 created_at=None):
+        """
+        Args:
+            username (str): Comment author
+            text (str): Cleaned comment text
+            likes (int): Like count
+            scroll_index (int): Scroll the comment was found on (0 = before scrolling)
+            extracted_at (float, optional): Unix timestamp of extraction (defaults to now)
+            comment_id (str, optional): Instagram comment id, when known
+            reply_to (str, optional): Username of the parent comment for replies
+            created_at (int, optional): Unix timestamp the comment was posted, when the source has it
+        """
+        self.username = username
+        self.text = text
+        self.likes = likes
+        self.scroll_index = scroll_index
+        self.extracted_at = time.time() if extracted_at is None else extracted_at
+        self.comment_id = comment_id
+        self.reply_to = reply_to
+        self.created_at = created_at
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: Field name -> value, JSON-serializable
+        """
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __repr__(self):
+        return f"CommentRecord({self.username!r}, {self.text[:30]!r}, likes={self.likes})"
+
+
+class CommentBatch:
+    """Ordered collection of CommentRecords, cheap to append to and concatenate"""
+
+    __slots__ = ("records",)
+
+    def __init__(self, records=None):
+        """
+        Args:
+            records (list, optional): Initial CommentRecords
+        """
+        self.records = list(records) if records else []
+
+    def add(self, username, text, likes=0, **fields):
+        """
+        Append a new record
+
+        Args:
+            username (str): Comment author
+            text (str): Cleaned comment text
+            likes (int): Like count
+            **fields: Other CommentRecord fields (scroll_index, comment_id, reply_to, ...)
+
+        Returns:
+            CommentRecord: The appended record
+        """
+        record = CommentRecord(username, text, likes, **fields)
+        self.records.append(record)
+        return record
+
+    def extend(self, other):
+        """
+        Append all records of another batch (or iterable of records)
+
+        Args:
+            other (CommentBatch or iterable): Records to append
+        """
+        self.records.extend(other.records if isinstance(other, CommentBatch) else other)
+
+    @classmethod
+    def from_dicts(cls, rows):
+        """
+        Rebuild a batch from CommentRecord.to_dict() output
+
+        Args:
+            rows (list): Record dicts
+
+        Returns:
+            CommentBatch: Batch with one record per dict
+        """
+        return cls(CommentRecord(**row) for row in rows)
+
+    def to_dicts(self):
+        """
+        Returns:
+            list: One CommentRecord.to_dict() per record
+        """
+        return [record.to_dict() for record in self.records]
+
+    def set_scroll_index(self, scroll_index):
+        """
+        Tag every record with the scroll it was extracted on
+
+        Args:
+            scroll_index (int): Scroll number (0 = before scrolling)
+        """
+        for record in self.records:
+            record.scroll_index = scroll_index
+
+    @property
+    def usernames(self):
+        return [record.username for record in self.records]
+
+    @property
+    def comments(self):
+        return [record.text for record in self.records]
+
+    @property
+    def likes(self):
+        return [record.likes for record in self.records]
+
+    @property
+    def has_replies(self):
+        return any(record.reply_to for record in self.records)
+
+    @property
+    def has_comment_ids(self):
+        return any(record.comment_id for record in self.records)
+
+    @property
+    def has_created_at(self):
+        return any(record.created_at for record in self.records)
+
+    def __add__(self, other):
+        return CommentBatch(self.records + other.records)
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, index):
+        return self.records[index]
+
+    def __repr__(self):
+        return f"CommentBatch({len(self.records)} comments)"
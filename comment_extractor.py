@@ -3,15 +3,253 @@ Comment Extractor Module
 Handles extraction of comments from Instagram pages and containers.
 """
 
+import json
+import re
 import time
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from comment_batch import CommentBatch
 from text_validator import (
     is_valid_text, is_valid_username_comment_pair, 
-    clean_comment_text, create_comment_key, FOOTER_TERMS
+    clean_comment_text, create_comment_key, parse_comment_id, FOOTER_TERMS, NOISE_PATTERN, DEFAULT_VALIDATOR
 )
 
 
-def extract_initial_comments(driver, comments_container, processed_comments, raw_output_file=None):
+# Extraction engines selectable from main_scraper / the scroll loop
+ENGINE_SELENIUM = "selenium"   # one WebDriver call per link/span (original path)
+ENGINE_SNAPSHOT = "snapshot"   # one execute_script per scroll, records built in the browser
+ENGINE_HTML = "html"           # one page_source per scroll, parsed locally (html_comment_parser)
+ENGINE_NETWORK = "network"     # comment JSON captured from the page's own API responses (network_capture)
+EXTRACTION_ENGINES = (ENGINE_SELENIUM, ENGINE_SNAPSHOT, ENGINE_HTML, ENGINE_NETWORK)
+
+# Scroll waits: return as soon as new content shows up, give up after the ceiling
+SCROLL_WAIT_TIMEOUT = 6.0      # seconds
+SCROLL_POLL_INTERVAL = 0.2     # seconds
+
+# Auto scroll budget: scroll until the post's reported comment count is reached or growth stalls
+AUTO_MAX_SCROLLS = 300         # hard ceiling for auto-budget runs
+AUTO_STALL_SCROLLS = 3         # consecutive scrolls without a new comment before giving up
+
+# Like-count parsing ("1,234 likes", "12.5K likes", "Liked by x and 3 others")
+LIKE_WORDS_PATTERN = re.compile(r'\b(like|likes|others?)\b')
+LIKE_NUMBER_PATTERN = re.compile(r'([0-9,]+\.?[0-9]*)[\s]?([kmb])?')
+PLAIN_NUMBER_PATTERN = re.compile(r'\b\d{1,}\b')
+NUMBER_SUFFIXES = {'k': 1000, 'm': 1000000, 'b': 1000000000}
+
+# scrollHeight plus the number of candidate username links, read in one call
+CONTAINER_STATE_SCRIPT = """
+var container = arguments[0];
+return [container.scrollHeight, container.querySelectorAll("a[href*='/']").length];
+"""
+
+
+# Browser-side helpers mirroring the Selenium-element path:
+#   - username links: same filter as the XPath in extract_comments_from_container
+#   - comment parent: same walk as _find_comment_parent
+#   - likes index: each like-bearing text or aria-label goes to the last comment
+#     block that starts before it; only the stretch after each block is walked,
+#     up to the next block (blocks are stamped data-ig-block once seen)
+# In incremental mode links are stamped with data-ig-scraped once their comment
+# block has rendered (a span outside the link passes the text filter), so later
+# scrolls only visit nodes added since the last one.
+_JS_COMMENT_HELPERS = f"""
+var FOOTER_TERMS = new Set({json.dumps(sorted(FOOTER_TERMS))});
+var NOISE_PATTERN = new RegExp({json.dumps('^(?:' + NOISE_PATTERN.pattern + ')$')}, 'i');
+""" + """
+function findUsernameLinks(container, onlyFresh) {
+    var selector = onlyFresh ? "a[href*='/']:not([data-ig-scraped])" : "a[href*='/']";
+    return Array.prototype.filter.call(container.querySelectorAll(selector), isUsernameLink);
+}
+
+function isUsernameLink(el) {
+    var href = el.tagName === 'A' ? el.getAttribute('href') || '' : '';
+    return href.indexOf('/') !== -1 && href.indexOf('explore') === -1 && href.indexOf('accounts') === -1;
+}
+
+function isCommentText(text, username) {
+    // Same check as _pick_comment_text: DEFAULT_VALIDATOR with min_length=2, not the username
+    return text.length >= 2 && text !== username && !FOOTER_TERMS.has(text) && !NOISE_PATTERN.test(text);
+}
+
+function isRendered(link, parent) {
+    // The link's own span[dir='auto'] doesn't count, the comment text has to be there
+    if (!parent) {
+        return false;
+    }
+    var username = (link.innerText || '').trim();
+    return Array.prototype.some.call(parent.querySelectorAll("span[dir='auto']"), function (span) {
+        return !link.contains(span) && isCommentText((span.innerText || '').trim(), username);
+    });
+}
+
+function markScraped(link, parent) {
+    if (isRendered(link, parent)) {
+        link.setAttribute('data-ig-scraped', '1');
+    }
+}
+
+function findCommentParent(link) {
+    var parent = link.parentElement;
+    while (parent && (parent.getAttribute('class') || '').indexOf('html-div') === -1) {
+        parent = parent.parentElement;
+    }
+    if (!parent) {
+        return null;
+    }
+    for (var i = 0; i < 3; i++) {
+        if (!parent.parentElement) {
+            break;
+        }
+        parent = parent.parentElement;
+        if (parent.querySelector("span[dir='auto']")) {
+            break;
+        }
+    }
+    return parent;
+}
+
+function commentId(parent) {
+    // Id from the block's permalink ('/p/<code>/c/<id>/'), the first one is the block's own
+    var permalink = parent ? parent.querySelector("a[href*='/c/']") : null;
+    var match = permalink ? /\/c\/(\d+)/.exec(permalink.getAttribute('href') || '') : null;
+    return match ? match[1] : null;
+}
+
+function ownText(el) {
+    var text = '';
+    for (var i = 0; i < el.childNodes.length; i++) {
+        if (el.childNodes[i].nodeType === 3) {
+            text += el.childNodes[i].nodeValue;
+        }
+    }
+    return text;
+}
+
+function isLikeBearing(el) {
+    return ownText(el).toLowerCase().indexOf('like') !== -1;
+}
+
+function likeLabel(el) {
+    if (el.tagName !== 'BUTTON' && el.getAttribute('role') !== 'button') {
+        return '';
+    }
+    var label = el.getAttribute('aria-label') || '';
+    return label.toLowerCase().indexOf('like') !== -1 ? label : '';
+}
+
+function buildLikesIndex(container, parents) {
+    // parents[i] is the comment block of link i (may be null or shared between links)
+    var index = parents.map(function () { return []; });
+    var owners = new Map();
+    parents.forEach(function (parent, i) {
+        if (!parent) {
+            return;
+        }
+        if (!owners.has(parent)) {
+            var bound = parent;
+            for (var level = 0; level < 3 && bound.parentElement; level++) {
+                bound = bound.parentElement;
+            }
+            owners.set(parent, {indices: [], bound: bound});
+            parent.setAttribute('data-ig-block', '1');
+        }
+        owners.get(parent).indices.push(i);
+    });
+
+    // Any comment block ends the previous one's stretch, not only the blocks in this call:
+    // ones stamped data-ig-block by an earlier call, and unseen ones found by their username link
+    function startsOtherBlock(el, parent) {
+        return el !== parent && (owners.has(el) || el.hasAttribute('data-ig-block') ||
+            (isUsernameLink(el) && findCommentParent(el) !== parent));
+    }
+
+    // Each block's like texts sit between it and the next block, inside its bound: walk only
+    // that stretch instead of the whole container (in incremental mode just the fresh blocks)
+    owners.forEach(function (owner, parent) {
+        var walker = document.createTreeWalker(owner.bound, NodeFilter.SHOW_ELEMENT);
+        var el = parent !== container ? parent : null;
+        walker.currentNode = parent;
+        while (el && container.contains(el) && !startsOtherBlock(el, parent)) {
+            var texts = [];
+            if (isLikeBearing(el)) {
+                texts.push((el.innerText || '').trim());
+            }
+            var label = likeLabel(el);
+            if (label) {
+                texts.push(label);
+            }
+            texts.forEach(function (text) {
+                owner.indices.forEach(function (j) {
+                    index[j].push(text);
+                });
+            });
+            el = walker.nextNode();
+        }
+    });
+    return index;
+}
+"""
+
+COMMENT_SNAPSHOT_SCRIPT = _JS_COMMENT_HELPERS + """
+var container = arguments[0];
+var incremental = arguments[1];
+var links = findUsernameLinks(container, incremental);
+var parents = links.map(findCommentParent);
+var likesIndex = buildLikesIndex(container, parents);
+var records = [];
+links.forEach(function (link, i) {
+    var parent = parents[i];
+    if (incremental) {
+        markScraped(link, parent);
+    }
+    if (!parent) {
+        return;
+    }
+    records.push({
+        username: (link.innerText || '').trim(),
+        href: link.getAttribute('href'),
+        comment_id: commentId(parent),
+        span_texts: Array.prototype.map.call(parent.querySelectorAll("span[dir='auto']"), function (span) {
+            return (span.innerText || '').trim();
+        }),
+        like_texts: likesIndex[i]
+    });
+});
+return records;
+"""
+
+# Like texts for a list of username links, resolved for all of them in one pass
+LIKES_INDEX_SCRIPT = _JS_COMMENT_HELPERS + """
+return buildLikesIndex(arguments[0], arguments[1].map(findCommentParent));
+"""
+
+# Permalink comment id per username link (null when the block has none)
+COMMENT_IDS_SCRIPT = _JS_COMMENT_HELPERS + """
+return arguments[0].map(function (link) {
+    return commentId(findCommentParent(link));
+});
+"""
+
+# True once some username link's comment block has its text rendered (whole page when no container)
+COMMENTS_RENDERED_SCRIPT = _JS_COMMENT_HELPERS + """
+return findUsernameLinks(arguments[0] || document.body, false).some(function (link) {
+    return isRendered(link, findCommentParent(link));
+});
+"""
+
+# Returns the username links not visited by a previous incremental pass and stamps them
+FRESH_LINKS_SCRIPT = _JS_COMMENT_HELPERS + """
+var links = findUsernameLinks(arguments[0], true);
+links.forEach(function (link) {
+    markScraped(link, findCommentParent(link));
+});
+return links;
+"""
+
+
+def extract_initial_comments(driver, comments_container, processed_comments, raw_output_file=None,
+                             engine=ENGINE_SELENIUM, incremental=False):
     """
     Extract initial comments before any scrolling
     
@@ -20,23 +258,119 @@ def extract_initial_comments(driver, comments_container, processed_comments, raw
         comments_container: Comments container element (can be None)
         processed_comments (set): Set to track processed comments
         raw_output_file (str, optional): Path to file for writing raw comments
+        engine (str): Extraction engine, one of EXTRACTION_ENGINES
+        incremental (bool): Stamp visited comment nodes so later scrolls skip them
         
     Returns:
-        tuple: (usernames, comments, likes) lists
+        CommentBatch: Extracted comments
     """
+    if engine == ENGINE_NETWORK:
+        # Comments already on the page were downloaded before the hook existed,
+        # so take them from the DOM and capture everything after this point
+        from network_capture import install_capture_hook
+        install_capture_hook(driver)
+        engine = ENGINE_SNAPSHOT
+    
     if comments_container:
         print("Using comments container for initial extraction")
         # if raw_output_file:
         #     with open(raw_output_file, 'w', encoding='utf-8') as f:
         #         f.write("=== RAW COMMENT EXTRACTION LOG ===\n")
         #         f.write("=== INITIAL EXTRACTION ===\n")
-        return extract_comments_from_container(comments_container, processed_comments, raw_output_file)
+        return extract_comments(driver, comments_container, processed_comments, raw_output_file,
+                                engine, incremental)
     else:
         print("No container found, extracting from entire page")
         return extract_comments_fallback(driver, processed_comments)
 
 
-def extract_comments_from_container(container, processed_comments, raw_output_file=None):
+def extract_comments(driver, container, processed_comments, raw_output_file=None, engine=ENGINE_SELENIUM,
+                     incremental=False, comment_authors=None):
+    """
+    Extract comments from a container with the selected engine and report how long it took
+    
+    Args:
+        driver: WebDriver instance
+        container: WebElement container to extract from
+        processed_comments (set): Set to track processed comments
+        raw_output_file (str, optional): Path to file for writing raw comments
+        engine (str): Extraction engine, one of EXTRACTION_ENGINES
+        incremental (bool): Only visit comment nodes added since the previous incremental pass
+            (ignored by the html and network engines)
+        comment_authors (dict, optional): Comment id -> username for this scrape, lets the
+            network engine tag replies whose parent came in an earlier payload
+        
+    Returns:
+        CommentBatch: Extracted comments
+    """
+    start_time = time.perf_counter()
+    
+    if engine == ENGINE_SNAPSHOT:
+        result = extract_comments_from_snapshot(driver, container, processed_comments, raw_output_file,
+                                                incremental)
+    elif engine == ENGINE_HTML:
+        # Imported here so lxml is only needed when this engine is selected
+        from html_comment_parser import extract_comments_from_html
+        result = extract_comments_from_html(driver.page_source, processed_comments, raw_output_file)
+    elif engine == ENGINE_NETWORK:
+        from network_capture import extract_comments_from_network
+        result = extract_comments_from_network(driver, processed_comments, raw_output_file, comment_authors)
+    else:
+        result = extract_comments_from_container(container, processed_comments, raw_output_file,
+                                                 incremental)
+    
+    elapsed = time.perf_counter() - start_time
+    print(f"  ⏱️  {engine} extraction took {elapsed:.2f}s")
+    return result
+
+
+def extract_comments_from_snapshot(driver, container, processed_comments, raw_output_file=None, incremental=False):
+    """
+    Extract comments from a container with a single execute_script round trip.
+    
+    The browser returns one record per username link; validation and dedup
+    stay on the Python side so results match extract_comments_from_container.
+    
+    Args:
+        driver: WebDriver instance
+        container: WebElement container to extract from
+        processed_comments (set): Set to track processed comments
+        raw_output_file (str, optional): Path to file for writing raw comments
+        incremental (bool): Only return comment nodes not stamped by a previous pass
+        
+    Returns:
+        CommentBatch: Extracted comments
+    """
+    batch = CommentBatch()
+    
+    try:
+        records = driver.execute_script(COMMENT_SNAPSHOT_SCRIPT, container, incremental) or []
+        print(f"  📋 Snapshot returned {len(records)} potential comment blocks")
+        
+        for record in records:
+            username = (record.get("username") or "").strip()
+            
+            # Skip invalid usernames
+            if not is_valid_text(username) or username in FOOTER_TERMS:
+                continue
+            
+            comment_text = _pick_comment_text(record.get("span_texts") or [], username)
+            
+            if comment_text and is_valid_username_comment_pair(username, comment_text):
+                likes_count = _likes_from_texts(record.get("like_texts") or [])
+                
+                if _add_unique_comment(username, comment_text, processed_comments,
+                                     batch, likes_count, comment_id=record.get("comment_id")):
+                    likes_display = f" ({likes_count} likes)" if likes_count > 0 else ""
+                    print(f"  {username}: {comment_text[:60]}...{likes_display}")
+    
+    except Exception as e:
+        print(f"  Error extracting from snapshot: {e}")
+    
+    return batch
+
+
+def extract_comments_from_container(container, processed_comments, raw_output_file=None, incremental=False):
     """
     Extract comments from a specific container
     
@@ -44,28 +378,35 @@ def extract_comments_from_container(container, processed_comments, raw_output_fi
         container: WebElement container to extract from
         processed_comments (set): Set to track processed comments
         raw_output_file (str, optional): Path to file for writing raw comments
+        incremental (bool): Only visit username links not stamped by a previous pass
         
     Returns:
-        tuple: (usernames, comments, likes) lists
+        CommentBatch: Extracted comments
     """
-    user_names = []
-    user_comments = []
-    comment_likes = []
+    batch = CommentBatch()
     
     try:
         # Find username links within the container
-        username_links = container.find_elements(
-            By.XPATH, 
-            ".//a[contains(@href, '/') and not(contains(@href, 'explore')) and not(contains(@href, 'accounts'))]"
-        )
+        if incremental:
+            # container.parent is the WebDriver that owns the element
+            username_links = container.parent.execute_script(FRESH_LINKS_SCRIPT, container) or []
+        else:
+            username_links = container.find_elements(
+                By.XPATH, 
+                ".//a[contains(@href, '/') and not(contains(@href, 'explore')) and not(contains(@href, 'accounts'))]"
+            )
         print(f"  📋 Found {len(username_links)} potential username links")
         
+        # Resolve likes and permalink ids for every link at once instead of searching per comment
+        likes_index = build_likes_index(container, username_links)
+        comment_ids = _find_comment_ids(container, username_links)
+        
         # Write raw data to file if provided
         # if raw_output_file:
         #     with open(raw_output_file, 'a', encoding='utf-8') as f:
         #         f.write(f"\n=== SCROLL EXTRACTION - Found {len(username_links)} username links ===\n")
         
-        for link in username_links:
+        for link, likes_count, comment_id in zip(username_links, likes_index, comment_ids):
             try:
                 username = link.text.strip()
                 
@@ -87,11 +428,8 @@ def extract_comments_from_container(container, processed_comments, raw_output_fi
                 #         f.write(f"RAW: {username} -> {comment_text}\n")
                 
                 if comment_text and is_valid_username_comment_pair(username, comment_text):
-                    # Extract likes count from parent
-                    likes_count = _extract_comment_likes(parent)
-                    
                     if _add_unique_comment(username, comment_text, processed_comments, 
-                                         user_names, user_comments, comment_likes, likes_count):
+                                         batch, likes_count, comment_id=comment_id):
                         likes_display = f" ({likes_count} likes)" if likes_count > 0 else ""
                         print(f"  {username}: {comment_text[:60]}...{likes_display}")
                         # if raw_output_file:
@@ -104,7 +442,55 @@ def extract_comments_from_container(container, processed_comments, raw_output_fi
     except Exception as e:
         print(f"  Error extracting from container: {e}")
     
-    return user_names, user_comments, comment_likes
+    return batch
+
+
+def build_likes_index(container, username_links):
+    """
+    Resolve like counts for a list of username links in one round trip
+    
+    Every like-bearing text or aria-label in the container is collected once
+    and assigned to the comment block it belongs to.
+    
+    Args:
+        container: WebElement container the links belong to
+        username_links (list): Username link WebElements
+        
+    Returns:
+        list: Like count per link (0 when none found), aligned with username_links
+    """
+    if not username_links:
+        return []
+    
+    try:
+        # container.parent is the WebDriver that owns the element
+        like_texts = container.parent.execute_script(LIKES_INDEX_SCRIPT, container, username_links) or []
+        return [_likes_from_texts(texts) for texts in like_texts]
+    except Exception as e:
+        print(f"  Error building likes index: {e}")
+        return [0] * len(username_links)
+
+
+def _find_comment_ids(container, username_links):
+    """
+    Read the permalink comment id of every link's comment block in one round trip
+    
+    Args:
+        container: WebElement container the links belong to
+        username_links (list): Username link WebElements
+        
+    Returns:
+        list: Comment id (or None) per link, aligned with username_links
+    """
+    if not username_links:
+        return []
+    
+    try:
+        # container.parent is the WebDriver that owns the element
+        return container.parent.execute_script(COMMENT_IDS_SCRIPT, username_links) or [None] * len(username_links)
+    except Exception as e:
+        print(f"  Error reading comment ids: {e}")
+        return [None] * len(username_links)
 
 
 def extract_comments_fallback(driver, processed_comments):
@@ -116,11 +502,9 @@ def extract_comments_fallback(driver, processed_comments):
         processed_comments (set): Set to track processed comments
         
     Returns:
-        tuple: (usernames, comments, likes) lists
+        CommentBatch: Extracted comments
     """
-    user_names = []
-    user_comments = []
-    comment_likes = []
+    batch = CommentBatch()
     
     try:
         # Get all spans with dir='auto' from the entire page
@@ -128,9 +512,10 @@ def extract_comments_fallback(driver, processed_comments):
         print(f"  📋 Found {len(all_spans)} total spans with dir='auto'")
         
         # Extract meaningful texts
+        span_texts = [span.text.strip() for span in all_spans]
         meaningful_texts = [
-            span.text.strip() for span in all_spans 
-            if is_valid_text(span.text.strip())
+            text for text, valid in zip(span_texts, DEFAULT_VALIDATOR.validate_many(span_texts))
+            if valid
         ]
         
         print(f"  📝 Extracted {len(meaningful_texts)} meaningful text elements")
@@ -143,7 +528,7 @@ def extract_comments_fallback(driver, processed_comments):
             
             if is_valid_username_comment_pair(potential_username, potential_comment):
                 if _add_unique_comment(potential_username, potential_comment, processed_comments,
-                                     user_names, user_comments, comment_likes, 0):  # Fallback method can't extract likes easily
+                                     batch, 0):  # Fallback method can't extract likes easily
                     print(f" {potential_username}: {potential_comment[:60]}...")
                     i += 2  # Skip both texts
                     continue
@@ -153,10 +538,65 @@ def extract_comments_fallback(driver, processed_comments):
     except Exception as e:
         print(f"  Fallback extraction failed: {e}")
     
-    return user_names, user_comments, comment_likes
+    return batch
+
+
+def wait_for_new_content(driver, container, previous_state, timeout=SCROLL_WAIT_TIMEOUT):
+    """
+    Wait until the container grows or new comment links appear
+    
+    Args:
+        driver: WebDriver instance
+        container: Comments container element
+        previous_state (list): [scrollHeight, link count] read before scrolling
+        timeout (float): Maximum number of seconds to wait
+        
+    Returns:
+        tuple: (loaded, latency, state) - whether new content appeared, seconds waited,
+            and the last observed [scrollHeight, link count]
+    """
+    start_time = time.perf_counter()
+    observed = {"state": previous_state}
+    
+    def _content_changed(d):
+        state = d.execute_script(CONTAINER_STATE_SCRIPT, container)
+        observed["state"] = state
+        return state[0] > previous_state[0] or state[1] > previous_state[1]
+    
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=SCROLL_POLL_INTERVAL).until(_content_changed)
+        loaded = True
+    except TimeoutException:
+        loaded = False
+    
+    return loaded, time.perf_counter() - start_time, observed["state"]
 
 
-def scroll_and_extract_comments(driver, comments_container, num_scrolls, processed_comments, raw_output_file=None):
+def wait_for_comments(driver, container=None, timeout=SCROLL_WAIT_TIMEOUT):
+    """
+    Wait until the first comment blocks have rendered, instead of a fixed settle delay
+    
+    Args:
+        driver: WebDriver instance
+        container: Comments container element (None checks the whole page)
+        timeout (float): Maximum number of seconds to wait
+        
+    Returns:
+        bool: True if comments showed up, False on timeout
+    """
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=SCROLL_POLL_INTERVAL).until(
+            lambda d: d.execute_script(COMMENTS_RENDERED_SCRIPT, container)
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
+def scroll_and_extract_comments(driver, comments_container, num_scrolls, processed_comments, raw_output_file=None,
+                                engine=ENGINE_SELENIUM, incremental=False, scroll_wait=SCROLL_WAIT_TIMEOUT,
+                                expand_replies=False, results=None, checkpoint=None, start_scroll=0,
+                                target_count=None, stall_scrolls=0):
     """
     Scroll the container and extract comments after each scroll
     
@@ -166,83 +606,181 @@ def scroll_and_extract_comments(driver, comments_container, num_scrolls, process
         num_scrolls (int): Number of scroll iterations
         processed_comments (set): Set to track processed comments
         raw_output_file (str, optional): Path to file for writing raw comments
+        engine (str): Extraction engine, one of EXTRACTION_ENGINES
+        incremental (bool): Only visit comment nodes added since the previous scroll
+        scroll_wait (float): Ceiling in seconds for waiting on new content after each scroll
+        expand_replies (bool): Expand reply threads after each scroll and tag replies with their parent
+        results (CommentBatch, optional): Batch to append to in place, so the caller keeps
+            what was collected if scrolling raises (a new batch by default)
+        checkpoint (ScrapeCheckpoint, optional): Gets the scroll position every scroll and
+            saves results plus processed_comments every checkpoint.every scrolls
+        start_scroll (int): Scrolls already done by a resumed run (numbering continues from here)
+        target_count (int, optional): Stop once this many comments are collected (the post's
+            exact reported comment count, which includes replies; never a rounded "1.2K" count)
+        stall_scrolls (int): Auto-budget mode when > 0: stop after this many consecutive scrolls
+            without a new comment; num_scrolls is then only a ceiling and the percentage-based
+            early stops are skipped
         
     Returns:
-        tuple: (usernames, comments, likes) lists
+        CommentBatch: Extracted comments, tagged with the scroll they were found on
     """
-    all_names = []
-    all_comments = []
-    all_likes = []
+    all_batch = results if results is not None else CommentBatch()
+    # Reply parents for the network engine, seeded from what this scrape (or its checkpoint) already has
+    comment_authors = {record.comment_id: record.username for record in all_batch if record.comment_id}
     
     if not comments_container:
         print(" No scrollable container found, using page scrolling fallback")
-        for i in range(num_scrolls):
+        # Nothing is extracted here, so an auto budget's ceiling would only waste time
+        page_scrolls = min(num_scrolls, stall_scrolls) if stall_scrolls else num_scrolls
+        for i in range(page_scrolls):
             driver.execute_script("window.scrollBy(0, 500);")
             time.sleep(2)
-            print(f"Page scroll {i+1}/{num_scrolls}")
-        return all_names, all_comments, all_likes
+            print(f"Page scroll {i+1}/{page_scrolls}")
+        return all_batch
     
-    print(f"🔄 Scrolling and extracting {num_scrolls} batches...")
+    if stall_scrolls:
+        target_text = f"{target_count} comments" if target_count is not None else "unknown comment count"
+        print(f"🔄 Scrolling until {target_text} or {stall_scrolls} scrolls without new comments "
+              f"(ceiling {num_scrolls})...")
+    else:
+        print(f"🔄 Scrolling and extracting {num_scrolls} batches...")
+    load_latencies = []
+    stalled = 0
     
-    for i in range(num_scrolls):
+    if target_count is not None and len(all_batch) >= target_count:
+        print(f"  🎯 Already have {len(all_batch)}/{target_count} comments, no scrolling needed")
+        return all_batch
+    
+    for i in range(start_scroll, num_scrolls):
         print(f"\n--- Scroll {i+1}/{num_scrolls} ---")
         
         # Get current state
-        initial_height = driver.execute_script("return arguments[0].scrollHeight;", comments_container)
-        initial_count = len(all_names)
+        initial_state = driver.execute_script(CONTAINER_STATE_SCRIPT, comments_container)
+        initial_height = initial_state[0]
+        initial_count = len(all_batch)
         
         # Scroll to bottom
         driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight;", comments_container)
         print(f"  📜 Scrolled to bottom (height: {initial_height}px)")
         
-        # Wait for new content with progressive waiting
-        time.sleep(3)
+        # Wait until new content arrives (or the ceiling is hit)
+        loaded, latency, new_state = wait_for_new_content(driver, comments_container, initial_state, scroll_wait)
+        
+        # If nothing arrived, try one more scroll attempt
+        if not loaded:
+            print(f"   No new content within {scroll_wait:.1f}s, trying additional scroll...")
+            driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight;", comments_container)
+            loaded, retry_latency, new_state = wait_for_new_content(
+                driver, comments_container, initial_state, scroll_wait
+            )
+            latency += retry_latency
+            
+            # Only stop if we've tried multiple times and are near the end (auto budget counts stalls instead)
+            if not loaded and not stall_scrolls and i > (num_scrolls * 0.1):  # Allow early stopping only after 10% of scrolls
+                print("   No new content after retries, stopping early")
+                break
         
-        # Check if new content loaded with retry logic
-        new_height = driver.execute_script("return arguments[0].scrollHeight;", comments_container)
-        print(f" New height: {new_height}px")
+        if loaded:
+            load_latencies.append(latency)
+            print(f"  ⚡ New content after {latency:.2f}s (height: {new_state[0]}px)")
         
-        # If no height change, try waiting longer and checking again
-        if new_height == initial_height:
-            print("   No immediate height change, waiting longer...")
-            time.sleep(3)  # Wait additional time
-            new_height = driver.execute_script("return arguments[0].scrollHeight;", comments_container)
-            print(f" Height after extra wait: {new_height}px")
-            
-            # If still no change, try one more scroll attempt
-            if new_height == initial_height:
-                print("   Trying additional scroll...")
-                driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight;", comments_container)
-                time.sleep(2)
-                new_height = driver.execute_script("return arguments[0].scrollHeight;", comments_container)
-                print(f" Height after extra scroll: {new_height}px")
-                
-                # Only stop if we've tried multiple times and are near the end
-                if new_height == initial_height and i > (num_scrolls * 0.1):  # Allow early stopping only after 10% of scrolls
-                    print("   No new content after retries, stopping early")
-                    break
+        # Expand all visible reply threads in one batch and take the replies first,
+        # so they are tagged with their parent before the regular pass sees them
+        if expand_replies:
+            from reply_expander import expand_reply_threads, extract_replies
+            if expand_reply_threads(driver, comments_container, scroll_wait):
+                replies = extract_replies(driver, comments_container, processed_comments)
+                replies.set_scroll_index(i + 1)
+                all_batch.extend(replies)
         
         # Extract new comments
         print("  🔍 Extracting new comments...")
         # if raw_output_file:
         #     with open(raw_output_file, 'a', encoding='utf-8') as f:
-        #         f.write(f"\n=== SCROLL {i+1} - Height: {initial_height}px -> {new_height}px ===\n")
-        new_names, new_comments, new_likes = extract_comments_from_container(comments_container, processed_comments, raw_output_file)
+        #         f.write(f"\n=== SCROLL {i+1} - Height: {initial_height}px -> {new_state[0]}px ===\n")
+        new_batch = extract_comments(
+            driver, comments_container, processed_comments, raw_output_file, engine, incremental,
+            comment_authors
+        )
+        
+        # Add to collection
+        new_batch.set_scroll_index(i + 1)
+        all_batch.extend(new_batch)
+        
+        new_count = len(all_batch) - initial_count
+        print(f" Extracted {new_count} new comments (Total: {len(all_batch)})")
         
-        # Add to collections
-        all_names.extend(new_names)
-        all_comments.extend(new_comments)
-        all_likes.extend(new_likes)
+        if checkpoint is not None:
+            checkpoint.update(i + 1, new_state[0])
+            if checkpoint.due():
+                checkpoint.save(all_batch, processed_comments)
         
-        new_count = len(all_names) - initial_count
-        print(f" Extracted {new_count} new comments (Total: {len(all_names)})")
+        if target_count is not None and len(all_batch) >= target_count:
+            print(f"  🎯 Reached the post's {target_count} comments")
+            break
+        
+        if stall_scrolls:
+            stalled = 0 if new_count else stalled + 1
+            if stalled >= stall_scrolls:
+                print(f"  🏁 No new comments for {stalled} scrolls, stopping at {len(all_batch)} comments")
+                break
+            continue
         
         # Check if reached bottom (only stop if we're well into scrolling)
         if i > (num_scrolls * 0.2) and _is_at_bottom(driver, comments_container):  # Only after 20% of scrolls
             print("  🏁 Reached bottom of comments container")
             break
     
-    return all_names, all_comments, all_likes
+    _print_load_latency_summary(load_latencies, scroll_wait)
+    return all_batch
+
+
+def fast_scroll_to(driver, container, target_height, scroll_wait=SCROLL_WAIT_TIMEOUT):
+    """
+    Scroll without extracting until the container is as tall as a previous run got it
+    
+    Args:
+        driver: WebDriver instance
+        container: Comments container element
+        target_height (int): scrollHeight to reach
+        scroll_wait (float): Ceiling in seconds for each load
+        
+    Returns:
+        int: scrollHeight reached
+    """
+    start_time = time.perf_counter()
+    state = driver.execute_script(CONTAINER_STATE_SCRIPT, container)
+    print(f"⏩ Fast-scrolling to {target_height}px (now {state[0]}px)...")
+    
+    while state[0] < target_height:
+        driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight;", container)
+        loaded, _, state = wait_for_new_content(driver, container, state, scroll_wait)
+        if not loaded:
+            print(f"   Container stopped growing at {state[0]}px")
+            break
+    
+    print(f"⏩ Reached {state[0]}px in {time.perf_counter() - start_time:.1f}s")
+    return state[0]
+
+
+def _print_load_latency_summary(latencies, ceiling):
+    """
+    Print observed per-scroll load latencies to help tune the wait ceiling
+    
+    Args:
+        latencies (list): Seconds until new content appeared, one per successful scroll
+        ceiling (float): Wait ceiling that was in effect
+    """
+    if not latencies:
+        print(f"\n⏱️  No scroll loaded new content within the {ceiling:.1f}s ceiling")
+        return
+    
+    ordered = sorted(latencies)
+    median = ordered[len(ordered) // 2]
+    p90 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))]
+    print(f"\n⏱️  Scroll load latency over {len(ordered)} scrolls: "
+          f"min {ordered[0]:.2f}s, median {median:.2f}s, p90 {p90:.2f}s, max {ordered[-1]:.2f}s "
+          f"(ceiling {ceiling:.1f}s)")
 
 
 def _find_comment_parent(link):
@@ -282,107 +820,47 @@ def _extract_comment_text_from_parent(parent, username):
     """
     try:
         all_spans = parent.find_elements(By.CSS_SELECTOR, "span[dir='auto']")
-        comment_text = ""
-        
-        for span in all_spans:
-            text = span.text.strip()
-            if (text and text != username and 
-                is_valid_text(text, min_length=2) and
-                len(text) > len(comment_text)):
-                comment_text = text
-        
-        return comment_text
+        return _pick_comment_text([span.text.strip() for span in all_spans], username)
     except:
         return ""
 
 
-def _extract_comment_likes(parent):
+def _pick_comment_text(span_texts, username):
     """
-    Extract likes count from comment parent container
+    Pick the comment text out of the span texts of a comment block
     
     Args:
-        parent: WebElement parent container
+        span_texts (list): Stripped texts of the block's span[dir='auto'] elements
+        username (str): Username to exclude from comment text
         
     Returns:
-        int: Number of likes if found, 0 otherwise
+        str: Longest valid text, empty string if none
     """
-    try:
-        # Strategy 1: Look for exact Instagram likes span pattern
-        try:
-            like_spans = parent.find_elements(By.XPATH, ".//span[contains(text(), 'like') or contains(text(), 'Like')]")
-            for span in like_spans:
-                text = span.text.strip()
-                if text and ("like" in text.lower() or "Like" in text):
-                    like_count = _extract_number_from_text(text)
-                    if like_count > 0:  # Only return if we found actual likes
-                        return like_count
-        except Exception:
-            pass
-        
-        # Strategy 2: Look in sibling/nearby elements for likes
-        try:
-            # Go up to find a broader container that might have likes info
-            current = parent
-            for level in range(3):  # Check parent and grandparent levels
-                # Look for any element with like-related text
-                all_elements = current.find_elements(By.XPATH, ".//*[contains(text(), 'like') or contains(text(), 'Like')]")
-                for elem in all_elements:
-                    text = elem.text.strip()
-                    if text and ("like" in text.lower() or "Like" in text):
-                        like_count = _extract_number_from_text(text)
-                        if like_count > 0:
-                            return like_count
-                
-                # Move up one level
-                try:
-                    current = current.find_element(By.XPATH, "./..")
-                except:
-                    break
-        except Exception:
-            pass
-        
-        # Strategy 3: Look for buttons or clickable elements that might show likes
-        try:
-            buttons = parent.find_elements(By.XPATH, ".//button | .//div[@role='button']")
-            for button in buttons:
-                # Check aria-label
-                aria_label = button.get_attribute("aria-label")
-                if aria_label and "like" in aria_label.lower():
-                    like_count = _extract_number_from_text(aria_label)
-                    if like_count > 0:
-                        return like_count
-                
-                # Check text content
-                text = button.text.strip()
-                if text and "like" in text.lower():
-                    like_count = _extract_number_from_text(text)
-                    if like_count > 0:
-                        return like_count
-        except Exception:
-            pass
+    comment_text = ""
+    
+    for text, valid in zip(span_texts, DEFAULT_VALIDATOR.validate_many(span_texts, min_length=2)):
+        if valid and text != username and len(text) > len(comment_text):
+            comment_text = text
+    
+    return comment_text
+
+
+def _likes_from_texts(texts):
+    """
+    Get the first positive like count from a list of like-bearing texts
+    
+    Args:
+        texts (list): Texts or aria-labels mentioning likes, in priority order
         
-        # Strategy 4: Instagram class-based search
-        try:
-            class_selectors = [
-                "span.x1lliihq.x193iq5w.x6ikm8r.x10wlt62.xlyipyv.xuxw1ft",
-                "span[class*='x1lliihq']",
-                "span[class*='x193iq5w']",
-            ]
-            
-            for selector in class_selectors:
-                elements = parent.find_elements(By.CSS_SELECTOR, selector)
-                for element in elements:
-                    text = element.text.strip()
-                    if text and "like" in text.lower():
-                        like_count = _extract_number_from_text(text)
-                        if like_count > 0:
-                            return like_count
-        except Exception:
-            pass
-                
-        return 0
-    except Exception:
-        return 0
+    Returns:
+        int: Number of likes if found, 0 otherwise
+    """
+    for text in texts:
+        if text and "like" in text.lower():
+            like_count = _extract_number_from_text(text)
+            if like_count > 0:
+                return like_count
+    return 0
 
 
 def _extract_number_from_text(text):
@@ -395,36 +873,26 @@ def _extract_number_from_text(text):
     Returns:
         int: Extracted number, 0 if none found
     """
-    import re
-    
     if not text:
         return 0
         
     # Remove common words and clean text
-    clean_text = re.sub(r'\b(like|likes|others?)\b', '', text.lower()).strip()
+    clean_text = LIKE_WORDS_PATTERN.sub('', text.lower()).strip()
     
     # Look for numbers with K/M suffixes
-    match = re.search(r'([0-9,]+\.?[0-9]*)[\s]?([kmb])?', clean_text)
+    match = LIKE_NUMBER_PATTERN.search(clean_text)
     if match:
         number_str = match.group(1).replace(',', '')
         suffix = match.group(2)
         
         try:
-            number = float(number_str)
-            
-            if suffix == 'k':
-                number *= 1000
-            elif suffix == 'm':
-                number *= 1000000
-            elif suffix == 'b':
-                number *= 1000000000
-                
+            number = float(number_str) * NUMBER_SUFFIXES.get(suffix, 1)
             return int(number)
         except ValueError:
             pass
     
     # Look for plain numbers
-    numbers = re.findall(r'\b\d{1,}\b', clean_text)
+    numbers = PLAIN_NUMBER_PATTERN.findall(clean_text)
     if numbers:
         try:
             return int(numbers[0])
@@ -434,31 +902,41 @@ def _extract_number_from_text(text):
     return 0
 
 
-def _add_unique_comment(username, comment, processed_comments, user_names, user_comments, comment_likes, likes_count=0):
+def _add_unique_comment(username, comment, processed_comments, batch, likes_count=0, **fields):
     """
     Add comment if it's unique (not already processed)
     
+    One key per comment: its id when known, its text key otherwise. A sighting with
+    an id also matches a text key left by an earlier id-less sighting of the same
+    comment, which then gives way to the id, so one id never blocks a different id.
+    
     Args:
         username (str): Username
         comment (str): Comment text
         processed_comments (set): Set of processed comment keys
-        user_names (list): List to add username to
-        user_comments (list): List to add comment to
-        comment_likes (list): List to add likes to
+        batch (CommentBatch): Batch to add the comment to
         likes_count (int): Number of likes for this comment
+        **fields: Extra CommentRecord fields (comment_id, reply_to, ...)
         
     Returns:
         bool: True if comment was added, False if duplicate
     """
-    comment_key = create_comment_key(username, comment)
-    if comment_key not in processed_comments:
-        user_names.append(username)
-        user_comments.append(clean_comment_text(comment))
-        comment_likes.append(likes_count)
-        processed_comments.add(comment_key)
-        return True
-    return False
-
+    fields["comment_id"] = parse_comment_id(fields.get("comment_id"))
+    comment_key = create_comment_key(username, comment, fields["comment_id"])
+    if comment_key in processed_comments:
+        return False
+    
+    if fields["comment_id"]:
+        text_key = create_comment_key(username, comment)
+        if text_key in processed_comments:
+            # Seen before without an id (fallback pass, failed id lookup): swap its key for the id
+            processed_comments.discard(text_key)
+            processed_comments.add(comment_key)
+            return False
+    
+    batch.add(username, clean_comment_text(comment), likes_count, **fields)
+    processed_comments.add(comment_key)
+    return True
 
 
 def _is_at_bottom(driver, container):
@@ -0,0 +1,207 @@
+"""
+Comment Fetcher Module
+Pages through a post's comments over plain HTTP (no browser), the same way
+InstagramPrivSniffer fetches profiles with the X-IG-App-ID header.
+
+Usage:
+    python comment_fetcher.py <instagram_post_url> [output_filename]
+    python comment_fetcher.py --bench [total_comments] [page_size]
+"""
+
+import re
+import sys
+import time
+
+import requests
+
+from comment_batch import CommentBatch
+from comment_extractor import _add_unique_comment
+from network_capture import parse_comment_payload, tag_replies
+from text_validator import is_valid_username_comment_pair
+
+
+INSTAGRAM_BASE_URL = "https://www.instagram.com"
+IG_APP_ID = "936619743392459"
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:128.0) "
+              "Gecko/20100101 Firefox/128.0")
+
+SHORTCODE_PATTERN = re.compile(r"/(?:reel|reels|p|tv)/([A-Za-z0-9_-]+)")
+SHORTCODE_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+
+
+def shortcode_from_url(post_url):
+    """
+    Get the shortcode out of a post/reel URL
+
+    Args:
+        post_url (str): Instagram post URL
+
+    Returns:
+        str or None: Shortcode if found, None otherwise
+    """
+    match = SHORTCODE_PATTERN.search(post_url)
+    return match.group(1) if match else None
+
+
+def shortcode_to_media_id(shortcode):
+    """
+    Decode a shortcode into the numeric media id used by the API
+
+    Private-account shortcodes carry extra characters after the first 11,
+    which encode the media id on their own.
+
+    Args:
+        shortcode (str): Post shortcode
+
+    Returns:
+        int: Media id
+    """
+    media_id = 0
+    for char in shortcode[:11]:
+        media_id = media_id * 64 + SHORTCODE_ALPHABET.index(char)
+    return media_id
+
+
+def create_session(cookies=None):
+    """
+    Create a keep-alive session with the headers the web API expects
+
+    Args:
+        cookies (dict, optional): Cookies to send (e.g. sessionid for logged-in access)
+
+    Returns:
+        requests.Session: Configured session
+    """
+    session = requests.Session()
+    session.headers.update({
+        "X-IG-App-ID": IG_APP_ID,
+        "User-Agent": USER_AGENT,
+    })
+    if cookies:
+        session.cookies.update(cookies)
+    return session
+
+
+def iter_comments(post_url, session=None, base_url=INSTAGRAM_BASE_URL, max_pages=None, page_delay=0.0):
+    """
+    Yield comment records page by page, following the next_min_id cursor
+
+    Args:
+        post_url (str): Instagram post URL
+        session (requests.Session, optional): Session to reuse
+        base_url (str): API host (a mock_server.py URL for offline runs)
+        max_pages (int, optional): Stop after this many pages
+        page_delay (float): Seconds to sleep between pages
+
+    Yields:
+        dict: Comment records as returned by network_capture.parse_comment_payload,
+            with reply_to resolved by network_capture.tag_replies
+    """
+    shortcode = shortcode_from_url(post_url)
+    if not shortcode:
+        print(f"Could not find a shortcode in {post_url}")
+        return
+
+    session = session or create_session()
+    url = f"{base_url}/api/v1/media/{shortcode_to_media_id(shortcode)}/comments/"
+    cursor = None
+    pages = 0
+    comment_authors = {}
+
+    while max_pages is None or pages < max_pages:
+        params = {"can_support_threading": "true", "permalink_enabled": "false"}
+        if cursor:
+            params["min_id"] = cursor
+
+        response = session.get(url, params=params, timeout=30)
+        if response.status_code != 200:
+            print(f"  [{response.status_code}] Comment page request failed, stopping")
+            return
+
+        payload = response.json()
+        records = tag_replies(parse_comment_payload(payload.get("comments", [])), comment_authors)
+        pages += 1
+        yield from records
+
+        cursor = payload.get("next_min_id")
+        if not cursor or not records:
+            return
+        if page_delay:
+            time.sleep(page_delay)
+
+
+def fetch_comments(post_url, processed_comments, session=None, base_url=INSTAGRAM_BASE_URL, max_pages=None):
+    """
+    Fetch all comments of a post over HTTP
+
+    Args:
+        post_url (str): Instagram post URL
+        processed_comments (set): Set to track processed comments
+        session (requests.Session, optional): Session to reuse
+        base_url (str): API host
+        max_pages (int, optional): Stop after this many pages
+
+    Returns:
+        CommentBatch: Extracted comments
+    """
+    batch = CommentBatch()
+
+    try:
+        for record in iter_comments(post_url, session, base_url, max_pages):
+            username, text = record["username"], record["text"]
+            if not is_valid_username_comment_pair(username, text):
+                continue
+            _add_unique_comment(username, text, processed_comments, batch, record["likes"],
+                                comment_id=record["comment_id"], reply_to=record["reply_to"],
+                                created_at=record["created_at"])
+    except Exception as e:
+        print(f"  Error fetching comments over HTTP: {e}")
+
+    print(f"🌐 Fetched {len(batch)} comments over HTTP")
+    return batch
+
+
+def benchmark_fetcher(total_comments=5000, page_size=50):
+    """
+    Measure fetcher throughput against a local mock_server.py instance
+
+    Args:
+        total_comments (int): Synthetic comments on the mock post
+        page_size (int): Comments per page
+
+    Returns:
+        float: Comments per second
+    """
+    from mock_server import start_mock_server
+
+    server, base_url = start_mock_server(total_comments=total_comments, page_size=page_size)
+    try:
+        start_time = time.perf_counter()
+        batch = fetch_comments(f"{base_url}/reel/MOCKPOST123/", set(), base_url=base_url)
+        elapsed = time.perf_counter() - start_time
+    finally:
+        server.shutdown()
+
+    rate = len(batch) / elapsed if elapsed else 0.0
+    print(f"Fetched {len(batch)} comments in {server.comment_requests} requests, "
+          f"{elapsed:.2f}s ({rate:.0f} comments/sec)")
+    return rate
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "--bench":
+        bench_args = [int(arg) for arg in sys.argv[2:4]]
+        benchmark_fetcher(*bench_args)
+        sys.exit(0)
+
+    if len(sys.argv) < 2 or len(sys.argv) > 3:
+        print("Usage: python comment_fetcher.py <instagram_post_url> [output_filename]")
+        print("       python comment_fetcher.py --bench [total_comments] [page_size]")
+        sys.exit(1)
+
+    from data_processor import export_to_csv, print_results_summary
+
+    batch = fetch_comments(sys.argv[1], set())
+    print_results_summary(batch)
+    export_to_csv(batch, sys.argv[2] if len(sys.argv) == 3 else None,
+                  {"post_url": sys.argv[1]})
@@ -8,21 +8,19 @@ import time
 from datetime import datetime
 
 
-def export_to_csv(usernames, comments, likes, custom_filename=None, post_metadata=None):
+def export_to_csv(batch, custom_filename=None, post_metadata=None):
     """
     Export comments to CSV file
     
     Args:
-        usernames (list): List of usernames
-        comments (list): List of comments
-        likes (list): List of like counts
+        batch (CommentBatch): Extracted comments
         custom_filename (str, optional): Custom filename to use
         post_metadata (dict, optional): Post metadata including caption and date
         
     Returns:
         str or None: Filename if successful, None if failed
     """
-    if not usernames or not comments:
+    if not batch:
         print("\n❌ No comments to export")
         return None
     
@@ -49,13 +47,27 @@ def export_to_csv(usernames, comments, likes, custom_filename=None, post_metadat
             
             # Write comments header and data
             writer.writerow(['=== COMMENTS ==='])
-            writer.writerow(['Username', 'Comment', 'Likes'])
-            
-            for i in range(len(usernames)):
-                writer.writerow([usernames[i], comments[i], likes[i]])
+            # Optional columns only appear when some comment has them
+            with_replies = batch.has_replies
+            with_ids = batch.has_comment_ids
+            with_dates = batch.has_created_at
+            writer.writerow(['Username', 'Comment', 'Likes'] +
+                            (['Reply To'] if with_replies else []) +
+                            (['Comment ID'] if with_ids else []) +
+                            (['Posted At'] if with_dates else []))
+            for record in batch:
+                row = [record.username, record.text, record.likes]
+                if with_replies:
+                    row.append(record.reply_to or '')
+                if with_ids:
+                    row.append(record.comment_id or '')
+                if with_dates:
+                    row.append(datetime.fromtimestamp(record.created_at).strftime("%Y-%m-%d %H:%M:%S")
+                               if record.created_at else '')
+                writer.writerow(row)
         
         print(f"\nComments exported to {csv_filename} successfully!")
-        print(f"   Total comments saved: {len(usernames)}")
+        print(f"   Total comments saved: {len(batch)}")
         if post_metadata:
             print(f"   Post metadata included: {'✅ Caption' if post_metadata.get('caption') else '❌ Caption'}, {'✅ Date' if post_metadata.get('date') else '❌ Date'}")
         return csv_filename
@@ -65,23 +77,22 @@ def export_to_csv(usernames, comments, likes, custom_filename=None, post_metadat
         return None
 
 
-def print_results_summary(usernames, comments):
+def print_results_summary(batch):
     """
     Print a summary of extracted comments
     
     Args:
-        usernames (list): List of usernames
-        comments (list): List of comments
+        batch (CommentBatch): Extracted comments
     """
     print(f"\n{'='*60}")
-    print(f"FINAL RESULT: Extracted {len(usernames)} comments")
+    print(f"FINAL RESULT: Extracted {len(batch)} comments")
     print(f"{'='*60}")
     
-    if usernames:
+    if batch:
         print("\nSample comments:")
-        for i in range(min(10, len(usernames))):
-            comment_preview = comments[i][:80] + ('...' if len(comments[i]) > 80 else '')
-            print(f"  {i+1}. {usernames[i]}: {comment_preview}")
+        for i, record in enumerate(batch.records[:10]):
+            comment_preview = record.text[:80] + ('...' if len(record.text) > 80 else '')
+            print(f"  {i+1}. {record.username}: {comment_preview}")
     else:
         print("\nNo comments extracted!")
 
@@ -127,20 +138,18 @@ def print_extraction_progress(step, message, count=None):
         print(f"{step} {message}")
 
 
-def validate_extraction_results(usernames, comments, likes, min_expected=5):
+def validate_extraction_results(batch, min_expected=5):
     """
     Validate extraction results and provide feedback
     
     Args:
-        usernames (list): List of usernames
-        comments (list): List of comments  
-        likes (list): List of like counts
+        batch (CommentBatch): Extracted comments
         min_expected (int): Minimum expected comments
         
     Returns:
         bool: True if results are satisfactory, False otherwise
     """
-    total_comments = len(usernames)
+    total_comments = len(batch)
     
     if total_comments == 0:
         print("\nNo comments were extracted. This could indicate:")
@@ -154,10 +163,5 @@ def validate_extraction_results(usernames, comments, likes, min_expected=5):
         print(f"\nOnly {total_comments} comments extracted (expected at least {min_expected})")
         print("   Consider increasing scroll count or checking extraction logic")
     
-    # Check data consistency
-    if len(usernames) != len(comments) or len(comments) != len(likes):
-        print("\nData inconsistency detected: mismatched list lengths")
-        return False
-    
     print(f"\nExtraction successful: {total_comments} comments extracted")
     return True
\ No newline at end of file
@@ -0,0 +1,307 @@
+"""
+HTML Comment Parser Module
+Runs the comment extraction logic against a page_source string instead of live WebDriver elements.
+
+Usage:
+    python html_comment_parser.py <saved_page.html> [output_filename]
+"""
+
+import sys
+from lxml import html as lxml_html
+
+from comment_batch import CommentBatch
+from comment_extractor import _pick_comment_text, _likes_from_texts, _add_unique_comment
+from text_validator import (
+    is_valid_text, is_valid_username_comment_pair, parse_comment_id, FOOTER_TERMS, DEFAULT_VALIDATOR
+)
+
+
+# Same selectors as page_navigator.find_comments_container, written as XPath
+CONTAINER_XPATHS = [
+    "//div[contains(concat(' ', normalize-space(@class), ' '), ' x5yr21d ') and "
+    "contains(concat(' ', normalize-space(@class), ' '), ' xw2csxc ') and "
+    "contains(concat(' ', normalize-space(@class), ' '), ' x1odjw0f ') and "
+    "contains(concat(' ', normalize-space(@class), ' '), ' x1n2onr6 ')]",
+    "//div[contains(@class, 'x5yr21d') and contains(@class, 'xw2csxc')]",
+    "//div[contains(@class, 'x5yr21d')]",
+    "//div[contains(@style, 'overflow')]",
+]
+
+USERNAME_LINK_XPATH = ".//a[contains(@href, '/') and not(contains(@href, 'explore')) and not(contains(@href, 'accounts'))]"
+
+# First permalink ('/p/<code>/c/<id>/') inside a comment block is the block's own
+PERMALINK_XPATH = "(.//a[contains(@href, '/c/')])[1]/@href"
+
+# Text a browser would not render as part of the element's visible text
+_VISIBLE_TEXT_XPATH = ".//text()[not(ancestor::svg) and not(ancestor::script) and not(ancestor::style)]"
+
+
+def parse_page_source(page_source):
+    """
+    Parse a page_source string into an lxml tree
+
+    Args:
+        page_source (str): HTML of the page (driver.page_source or a saved dump)
+
+    Returns:
+        HtmlElement or None: Root element, None if the document is empty
+    """
+    if not page_source or not page_source.strip():
+        return None
+    return lxml_html.fromstring(page_source)
+
+
+def find_comments_container_in_tree(root):
+    """
+    Find the comments container in a parsed page
+
+    Args:
+        root: lxml root element
+
+    Returns:
+        HtmlElement or None: Comments container if found, None otherwise
+    """
+    for xpath in CONTAINER_XPATHS:
+        matches = root.xpath(xpath)
+        if matches:
+            return matches[0]
+    return None
+
+
+def extract_comments_from_html(page_source, processed_comments, raw_output_file=None):
+    """
+    Extract comments from a page_source string
+
+    Uses the comments container when present, otherwise pairs consecutive
+    span[dir='auto'] texts like extract_comments_fallback.
+
+    Args:
+        page_source (str): HTML of the page
+        processed_comments (set): Set to track processed comments
+        raw_output_file (str, optional): Path to file for writing raw comments
+
+    Returns:
+        CommentBatch: Extracted comments
+    """
+    try:
+        root = parse_page_source(page_source)
+    except Exception as e:
+        print(f"  Error parsing page source: {e}")
+        return CommentBatch()
+
+    if root is None:
+        print("  Page source is empty")
+        return CommentBatch()
+
+    container = find_comments_container_in_tree(root)
+    if container is None:
+        print("  No comments container in page source, pairing spans from entire page")
+        return extract_comments_from_tree_fallback(root, processed_comments)
+
+    return extract_comments_from_tree(container, processed_comments)
+
+
+def extract_comments_from_tree(container, processed_comments):
+    """
+    Extract comments from a parsed container element
+
+    Args:
+        container: lxml element to extract from
+        processed_comments (set): Set to track processed comments
+
+    Returns:
+        CommentBatch: Extracted comments
+    """
+    batch = CommentBatch()
+
+    username_links = container.xpath(USERNAME_LINK_XPATH)
+    print(f"  📋 Found {len(username_links)} potential username links")
+
+    parents = [_find_comment_parent(link) for link in username_links]
+    likes_index = _build_likes_index(container, parents)
+
+    for link, parent, like_texts in zip(username_links, parents, likes_index):
+        username = _node_text(link)
+
+        # Skip invalid usernames
+        if not is_valid_text(username) or username in FOOTER_TERMS:
+            continue
+
+        if parent is None:
+            continue
+
+        span_texts = [_node_text(span) for span in parent.xpath(".//span[@dir='auto']")]
+        comment_text = _pick_comment_text(span_texts, username)
+
+        if comment_text and is_valid_username_comment_pair(username, comment_text):
+            likes_count = _likes_from_texts(like_texts)
+
+            comment_id = parse_comment_id(next(iter(parent.xpath(PERMALINK_XPATH)), None))
+            if _add_unique_comment(username, comment_text, processed_comments,
+                                 batch, likes_count, comment_id=comment_id):
+                likes_display = f" ({likes_count} likes)" if likes_count > 0 else ""
+                print(f"  {username}: {comment_text[:60]}...{likes_display}")
+
+    return batch
+
+
+def extract_comments_from_tree_fallback(root, processed_comments):
+    """
+    Pair consecutive span[dir='auto'] texts as username:comment
+
+    Args:
+        root: lxml root element
+        processed_comments (set): Set to track processed comments
+
+    Returns:
+        CommentBatch: Extracted comments
+    """
+    batch = CommentBatch()
+
+    span_texts = [_node_text(span) for span in root.xpath("//span[@dir='auto']")]
+    meaningful_texts = [
+        text for text, valid in zip(span_texts, DEFAULT_VALIDATOR.validate_many(span_texts))
+        if valid
+    ]
+    print(f"  📝 Extracted {len(meaningful_texts)} meaningful text elements")
+
+    i = 0
+    while i < len(meaningful_texts) - 1:
+        potential_username = meaningful_texts[i]
+        potential_comment = meaningful_texts[i + 1]
+
+        if is_valid_username_comment_pair(potential_username, potential_comment):
+            if _add_unique_comment(potential_username, potential_comment, processed_comments,
+                                 batch, 0):
+                print(f" {potential_username}: {potential_comment[:60]}...")
+                i += 2
+                continue
+
+        i += 1
+
+    return batch
+
+
+def _node_text(element):
+    """
+    Approximate the visible text of an element (what WebElement.text returns)
+
+    Args:
+        element: lxml element
+
+    Returns:
+        str: Whitespace-normalized text
+    """
+    return " ".join("".join(element.xpath(_VISIBLE_TEXT_XPATH)).split())
+
+
+def _find_comment_parent(link):
+    """
+    Find the parent container that holds the comment text (same walk as comment_extractor)
+
+    Args:
+        link: lxml username link element
+
+    Returns:
+        HtmlElement or None: Parent container if found, None otherwise
+    """
+    ancestors = link.xpath("./ancestor::*[contains(@class, 'html-div')][1]")
+    if not ancestors:
+        return None
+
+    parent = ancestors[0]
+    for _ in range(3):
+        if parent.getparent() is None:
+            break
+        parent = parent.getparent()
+        if parent.xpath(".//span[@dir='auto']"):
+            break
+    return parent
+
+
+def _build_likes_index(container, parents):
+    """
+    Collect like-bearing texts and aria-labels in one pass over the container
+
+    Each one goes to the last comment block that starts before it, as long as
+    it lies within three levels above that block (same rule as the browser-side
+    buildLikesIndex in comment_extractor).
+
+    Args:
+        container: lxml container element
+        parents (list): Comment block per username link (None when not found)
+
+    Returns:
+        list: List of candidate texts per link, aligned with parents
+    """
+    index = [[] for _ in parents]
+    owners = {}
+    for i, parent in enumerate(parents):
+        if parent is None:
+            continue
+        if parent not in owners:
+            bound = parent
+            for _ in range(3):
+                if bound.getparent() is None:
+                    break
+                bound = bound.getparent()
+            owners[parent] = ([], bound)
+        owners[parent][0].append(i)
+
+    current = None
+    for element in container.iterdescendants():
+        if not isinstance(element.tag, str):
+            continue
+        if element in owners:
+            current = owners[element]
+        if current is None or not _is_within(element, current[1]):
+            continue
+
+        texts = []
+        own_text = "".join(element.xpath("./text()"))
+        if "like" in own_text.lower():
+            texts.append(_node_text(element))
+        if element.tag == "button" or element.get("role") == "button":
+            label = element.get("aria-label") or ""
+            if "like" in label.lower():
+                texts.append(label)
+
+        for text in texts:
+            for i in current[0]:
+                index[i].append(text)
+
+    return index
+
+
+def _is_within(element, ancestor):
+    """
+    Check whether element is ancestor or one of its descendants
+
+    Args:
+        element: lxml element
+        ancestor: lxml element
+
+    Returns:
+        bool: True if element lies inside ancestor
+    """
+    while element is not None:
+        if element is ancestor:
+            return True
+        element = element.getparent()
+    return False
+
+
+if __name__ == "__main__":
+    from data_processor import export_to_csv, print_results_summary
+
+    if len(sys.argv) < 2 or len(sys.argv) > 3:
+        print("Usage: python html_comment_parser.py <saved_page.html> [output_filename]")
+        sys.exit(1)
+
+    with open(sys.argv[1], 'r', encoding='utf-8') as f:
+        source = f.read()
+
+    batch = extract_comments_from_html(source, set())
+    print_results_summary(batch)
+    if len(sys.argv) == 3:
+        export_to_csv(batch, sys.argv[2])
@@ -0,0 +1,369 @@
+"""
+Job Queue Module
+Durable SQLite job store for batch scraping; a killed batch resumes where it stopped.
+
+Usage:
+    python job_queue.py add <jobs_file> [--db=scrape_jobs.db]
+    python job_queue.py run [--db=scrape_jobs.db] [--max-attempts=3] [--worker=<id>] [options]
+    python job_queue.py status [--db=scrape_jobs.db]
+    python job_queue.py retry [--db=scrape_jobs.db]
+
+jobs_file uses the parallel_runner format: <post_url> [number_of_scrolls|auto] [output_filename].
+A post URL is only ever queued once, so finished posts are never scraped again.
+Several `run` processes can share one database; claiming a job is atomic. Each runner
+renews a lease on its job while scraping; a job whose lease expired (its runner was
+killed) goes back to pending, jobs of live runners are never touched. A runner does not
+exit while other jobs are still running, so a killed runner's job is picked up once its
+lease expires; restarting with the same --worker id reclaims it right away.
+"""
+
+import os
+import socket
+import sqlite3
+import sys
+import threading
+import time
+
+from dotenv import load_dotenv
+
+
+DEFAULT_DB = "scrape_jobs.db"
+DEFAULT_MAX_ATTEMPTS = 3
+HEARTBEAT_INTERVAL = 30.0  # seconds between lease renewals while a job runs
+LEASE_TIMEOUT = 300.0      # seconds without a renewal before a running job counts as abandoned
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    post_url TEXT NOT NULL UNIQUE,
+    num_scrolls INTEGER NOT NULL,
+    output_filename TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    comment_count INTEGER,
+    worker TEXT,
+    started_at REAL,
+    heartbeat REAL,
+    finished_at REAL,
+    elapsed REAL,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+"""
+
+
+def default_worker_id():
+    """
+    Returns:
+        str: Name unique to this runner process (host:pid)
+    """
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class JobQueue:
+    """Scrape jobs stored in a SQLite file"""
+
+    def __init__(self, db_path=DEFAULT_DB):
+        """
+        Args:
+            db_path (str): Path to the SQLite database (created if missing)
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        # Databases created before leases existed lack the heartbeat column
+        columns = {row["name"] for row in self.conn.execute("PRAGMA table_info(jobs)")}
+        if "heartbeat" not in columns:
+            self.conn.execute("ALTER TABLE jobs ADD COLUMN heartbeat REAL")
+
+    def add_job(self, post_url, num_scrolls, output_filename=None):
+        """
+        Queue a post unless it is already in the store (in any status)
+
+        Args:
+            post_url (str): Instagram post URL
+            num_scrolls (int or str): Scroll budget (a count or "auto")
+            output_filename (str, optional): Output CSV filename
+
+        Returns:
+            bool: True if queued, False if the post was already known
+        """
+        cursor = self.conn.execute(
+            "INSERT OR IGNORE INTO jobs (post_url, num_scrolls, output_filename) VALUES (?, ?, ?)",
+            (post_url, num_scrolls, output_filename)
+        )
+        return cursor.rowcount == 1
+
+    def claim_next(self, worker):
+        """
+        Atomically take the oldest pending job and mark it running (with a fresh lease)
+
+        Args:
+            worker (str): Runner id recorded on the job (see default_worker_id)
+
+        Returns:
+            sqlite3.Row or None: The claimed job, None when nothing is pending
+        """
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            job = self.conn.execute(
+                "SELECT * FROM jobs WHERE status = ? ORDER BY id LIMIT 1", (STATUS_PENDING,)
+            ).fetchone()
+            if job is not None:
+                self.conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1, worker = ?, started_at = ?, heartbeat = ? "
+                    "WHERE id = ?",
+                    (STATUS_RUNNING, worker, time.time(), time.time(), job["id"])
+                )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        return job
+
+    def mark_done(self, job_id, comment_count):
+        """
+        Record a finished job
+
+        Args:
+            job_id (int): Job id
+            comment_count (int): Comments exported
+        """
+        now = time.time()
+        self.conn.execute(
+            "UPDATE jobs SET status = ?, comment_count = ?, finished_at = ?, elapsed = ? - started_at, "
+            "last_error = NULL WHERE id = ?",
+            (STATUS_DONE, comment_count, now, now, job_id)
+        )
+
+    def mark_failed(self, job_id, error, max_attempts=DEFAULT_MAX_ATTEMPTS):
+        """
+        Record a failed attempt; the job goes back to pending until it runs out of attempts
+
+        Args:
+            job_id (int): Job id
+            error (str): Error description
+            max_attempts (int): Attempts before the job is marked failed for good
+        """
+        now = time.time()
+        self.conn.execute(
+            "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+            "finished_at = ?, elapsed = ? - started_at, last_error = ? WHERE id = ?",
+            (max_attempts, STATUS_FAILED, STATUS_PENDING, now, now, str(error), job_id)
+        )
+
+    def renew_lease(self, job_id, worker):
+        """
+        Extend the lease on a running job
+
+        Args:
+            job_id (int): Job id
+            worker (str): Runner id that claimed the job
+
+        Returns:
+            bool: False if the job is no longer this runner's
+        """
+        cursor = self.conn.execute(
+            "UPDATE jobs SET heartbeat = ? WHERE id = ? AND status = ? AND worker = ?",
+            (time.time(), job_id, STATUS_RUNNING, worker)
+        )
+        return cursor.rowcount == 1
+
+    def requeue_interrupted(self, lease_timeout=LEASE_TIMEOUT):
+        """
+        Put 'running' jobs whose lease expired (their runner died) back in the queue
+
+        Args:
+            lease_timeout (float): Seconds since the last renewal after which a job is abandoned
+
+        Returns:
+            int: Number of jobs requeued
+        """
+        cursor = self.conn.execute(
+            "UPDATE jobs SET status = ? WHERE status = ? AND COALESCE(heartbeat, started_at, 0) < ?",
+            (STATUS_PENDING, STATUS_RUNNING, time.time() - lease_timeout)
+        )
+        return cursor.rowcount
+
+    def requeue_worker(self, worker):
+        """
+        Put jobs still marked running under this runner id back in the queue (a previous
+        run with the same --worker id was killed)
+
+        Args:
+            worker (str): Runner id
+
+        Returns:
+            int: Number of jobs requeued
+        """
+        cursor = self.conn.execute("UPDATE jobs SET status = ? WHERE status = ? AND worker = ?",
+                                   (STATUS_PENDING, STATUS_RUNNING, worker))
+        return cursor.rowcount
+
+    def retry_failed(self):
+        """
+        Give failed jobs another round of attempts
+
+        Returns:
+            int: Number of jobs requeued
+        """
+        cursor = self.conn.execute("UPDATE jobs SET status = ?, attempts = 0 WHERE status = ?",
+                                   (STATUS_PENDING, STATUS_FAILED))
+        return cursor.rowcount
+
+    def counts(self):
+        """
+        Count jobs per status
+
+        Returns:
+            dict: Status mapped to number of jobs
+        """
+        rows = self.conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def print_status(self):
+        """Print per-status counts and the failed jobs"""
+        counts = self.counts()
+        print(f"Jobs in {self.db_path}: " +
+              ", ".join(f"{counts.get(status, 0)} {status}"
+                        for status in (STATUS_PENDING, STATUS_RUNNING, STATUS_DONE, STATUS_FAILED)))
+        done = self.conn.execute(
+            "SELECT COUNT(*), SUM(comment_count), AVG(elapsed) FROM jobs WHERE status = ?", (STATUS_DONE,)
+        ).fetchone()
+        if done[0]:
+            print(f"  Done: {done[1] or 0} comments, {done[2] or 0:.1f}s per post on average")
+        for job in self.conn.execute("SELECT * FROM jobs WHERE status = ? ORDER BY id", (STATUS_FAILED,)):
+            print(f"  ❌ {job['post_url']} ({job['attempts']} attempts): {job['last_error']}")
+
+    def close(self):
+        """Close the database connection"""
+        self.conn.close()
+
+
+def _keep_lease(db_path, job_id, worker, stop):
+    """
+    Renew a job's lease every HEARTBEAT_INTERVAL until stop is set (runs on its own thread and connection)
+
+    Args:
+        db_path (str): Job database path
+        job_id (int): Job id
+        worker (str): Runner id that claimed the job
+        stop (threading.Event): Set when the job has finished
+    """
+    store = JobQueue(db_path)
+    try:
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            store.renew_lease(job_id, worker)
+    finally:
+        store.close()
+
+
+def run_queue(job_queue, options=None, headless=False, max_attempts=DEFAULT_MAX_ATTEMPTS, worker=None):
+    """
+    Scrape pending jobs one by one in a single browser session until the queue is empty
+
+    Args:
+        job_queue (JobQueue): Job store
+        options (dict, optional): Options as returned by main_scraper.parse_options
+        headless (bool): Run the browser headless
+        max_attempts (int): Attempts per job before it is marked failed
+        worker (str, optional): Runner id recorded on claimed jobs (unique host:pid by default)
+
+    Returns:
+        int: Number of jobs finished successfully in this run
+    """
+    from session_runner import ScraperSession
+
+    options = options or {}
+    worker = worker or default_worker_id()
+    print(f"Runner {worker}")
+    job_queue.print_status()
+
+    reclaimed = job_queue.requeue_worker(worker)
+    if reclaimed:
+        print(f"♻️  Reclaimed {reclaimed} jobs left running by an earlier {worker}")
+
+    finished = 0
+    with ScraperSession(headless, not options.get("no-login"), bool(options.get("lean"))) as session:
+        while True:
+            # Only jobs whose runner stopped renewing its lease; other live runners keep theirs
+            requeued = job_queue.requeue_interrupted()
+            if requeued:
+                print(f"♻️  Requeued {requeued} jobs abandoned by a dead runner")
+            job = job_queue.claim_next(worker)
+            if job is None:
+                # Jobs still running either finish or lose their lease and come back here
+                running = job_queue.counts().get(STATUS_RUNNING, 0)
+                if not running:
+                    break
+                print(f"⏳ Nothing pending, waiting on {running} running jobs (leases expire after {LEASE_TIMEOUT:.0f}s)")
+                time.sleep(HEARTBEAT_INTERVAL)
+                continue
+
+            print(f"\n{'='*60}")
+            print(f"JOB {job['id']} (attempt {job['attempts'] + 1}): {job['post_url']}")
+            print(f"{'='*60}")
+            # Retries pick up from the checkpoint the failed attempt left behind
+            job_options = dict(options, resume=True) if job["attempts"] else options
+            stop_lease = threading.Event()
+            lease = threading.Thread(target=_keep_lease, args=(job_queue.db_path, job["id"], worker, stop_lease),
+                                     daemon=True)
+            lease.start()
+            try:
+                # A batch only comes back once its CSV was written
+                batch = session.scrape(job["post_url"], job["num_scrolls"], job["output_filename"], job_options)
+                error = session.last_error
+            except Exception as e:
+                batch = None
+                error = e
+            finally:
+                stop_lease.set()
+                lease.join()
+
+            if batch is not None:
+                job_queue.mark_done(job["id"], len(batch))
+                finished += 1
+            else:
+                job_queue.mark_failed(job["id"], error, max_attempts)
+
+    print()
+    job_queue.print_status()
+    return finished
+
+
+if __name__ == "__main__":
+    from main_scraper import parse_options
+
+    load_dotenv()
+    positional = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    cli_options = parse_options([arg for arg in sys.argv[1:] if arg.startswith("--")])
+    store = JobQueue(cli_options.pop("db", DEFAULT_DB))
+    command = positional[0] if positional else None
+
+    if command == "add" and len(positional) == 2:
+        from parallel_runner import read_jobs
+        jobs = read_jobs(positional[1])
+        added = sum(store.add_job(*job) for job in jobs)
+        print(f"Queued {added} new jobs ({len(jobs) - added} already known)")
+    elif command == "run":
+        if "scroll-wait" in cli_options:
+            cli_options["scroll-wait"] = float(cli_options["scroll-wait"])
+        attempts = int(cli_options.pop("max-attempts", DEFAULT_MAX_ATTEMPTS))
+        worker_id = cli_options.pop("worker", None)
+        run_queue(store, cli_options, max_attempts=attempts, worker=worker_id)
+    elif command == "status":
+        store.print_status()
+    elif command == "retry":
+        print(f"Requeued {store.retry_failed()} failed jobs")
+    else:
+        print("Usage: python job_queue.py <add <jobs_file>|run|status|retry> [--db=scrape_jobs.db] [options]")
+        sys.exit(1)
+
+    store.close()
@@ -1,28 +1,151 @@
 """
 Login Handler Module
-Handles Instagram authentication.
+Handles Instagram authentication and reuses a saved session when it is still valid.
 """
 
+import json
+import os
+import time
+
 from prototypes.login import perform_instagram_login
 
 
-def login_to_instagram(driver, max_attempts=3):
+INSTAGRAM_URL = "https://www.instagram.com/"
+SESSION_FILE = "ig_session.json"  # holds the sessionid cookie, keep it private
+
+# One authenticated API call; resolves to the HTTP status (200 only when logged in)
+SESSION_CHECK_SCRIPT = """
+var done = arguments[arguments.length - 1];
+fetch('/api/v1/accounts/current_user/?edit=true', {
+    credentials: 'include',
+    redirect: 'manual',
+    headers: {'X-IG-App-ID': '936619743392459'}
+}).then(function (response) { done(response.status); }, function () { done(0); });
+"""
+
+
+def login_to_instagram(driver, max_attempts=3, session_file=SESSION_FILE):
     """
-    Login to Instagram using external login module
-    
+    Login to Instagram, restoring a saved session first when one exists
+
     Args:
         driver: WebDriver instance
         max_attempts (int): Maximum number of login attempts
-        
+        session_file (str, optional): Saved session path (None disables saving and restoring)
+
     Returns:
         bool: True if login successful, False otherwise
     """
+    start_time = time.perf_counter()
+    if session_file and restore_session(driver, session_file):
+        print(f"♻️  Restored saved session in {time.perf_counter() - start_time:.1f}s (full login skipped)")
+        return True
+
     print("Logging into Instagram...")
     login_success = perform_instagram_login(driver, max_attempts=max_attempts)
-    
+
     if not login_success:
         print("Login failed. Cannot proceed with scraping.")
         return False
-    
-    print("Login completed successfully!")
-    return True
\ No newline at end of file
+
+    print(f"Login completed successfully in {time.perf_counter() - start_time:.1f}s!")
+    if session_file:
+        save_session(driver, session_file)
+    return True
+
+
+def save_session(driver, session_file=SESSION_FILE):
+    """
+    Save the browser's Instagram cookies and local storage
+
+    Args:
+        driver: WebDriver instance on an instagram.com page
+        session_file (str): Path to write the session to
+
+    Returns:
+        bool: True if saved, False otherwise
+    """
+    try:
+        session = {
+            "saved_at": time.time(),
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script("return Object.assign({}, window.localStorage);") or {},
+        }
+        # Created owner-only since the file grants account access
+        fd = os.open(session_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(session, f)
+        print(f"💾 Session saved to {session_file}")
+        return True
+    except Exception as e:
+        print(f"Could not save session: {e}")
+        return False
+
+
+def load_session_cookies(session_file=SESSION_FILE):
+    """
+    Read the saved cookies as a name -> value dict (e.g. for comment_fetcher.create_session)
+
+    Args:
+        session_file (str): Saved session path
+
+    Returns:
+        dict: Cookie values, empty if there is no usable session file
+    """
+    try:
+        with open(session_file, 'r', encoding='utf-8') as f:
+            return {cookie["name"]: cookie["value"] for cookie in json.load(f).get("cookies", [])}
+    except (OSError, ValueError, KeyError):
+        return {}
+
+
+def restore_session(driver, session_file=SESSION_FILE):
+    """
+    Load a saved session into the browser and check that Instagram still accepts it
+
+    Args:
+        driver: WebDriver instance
+        session_file (str): Saved session path
+
+    Returns:
+        bool: True if the restored session is logged in, False otherwise
+    """
+    try:
+        with open(session_file, 'r', encoding='utf-8') as f:
+            session = json.load(f)
+    except (OSError, ValueError):
+        return False
+
+    cookies = session.get("cookies", [])
+    session_cookie = next((cookie for cookie in cookies if cookie.get("name") == "sessionid"), None)
+    if not session_cookie or session_cookie.get("expiry", float("inf")) <= time.time():
+        print("Saved session has no valid sessionid cookie, logging in normally")
+        return False
+
+    try:
+        # Cookies can only be set for the domain of the current page
+        driver.get(INSTAGRAM_URL)
+        for cookie in cookies:
+            try:
+                driver.add_cookie(cookie)
+            except Exception:
+                continue
+        driver.execute_script(
+            "var items = arguments[0]; Object.keys(items).forEach(function (key) {"
+            " window.localStorage.setItem(key, items[key]); });",
+            session.get("local_storage", {})
+        )
+
+        status = driver.execute_async_script(SESSION_CHECK_SCRIPT)
+    except Exception as e:
+        print(f"Could not restore session: {e}")
+        return False
+
+    if status != 200:
+        print(f"Saved session rejected (status {status}), logging in normally")
+        driver.delete_all_cookies()
+        return False
+
+    age_hours = (time.time() - session.get("saved_at", time.time())) / 3600
+    print(f"Saved session from {age_hours:.1f}h ago is still valid")
+    return True
@@ -12,44 +12,253 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 from browser_setup import setup_browser, close_browser
-from comment_extractor import extract_initial_comments, scroll_and_extract_comments
+from comment_batch import CommentBatch
+from comment_fetcher import create_session, fetch_comments
+from checkpoint import ScrapeCheckpoint, CHECKPOINT_EVERY
+from comment_extractor import (
+    extract_initial_comments, scroll_and_extract_comments, fast_scroll_to, wait_for_comments, ENGINE_SELENIUM,
+    EXTRACTION_ENGINES,
+    SCROLL_WAIT_TIMEOUT, AUTO_MAX_SCROLLS, AUTO_STALL_SCROLLS
+)
 from data_processor import export_to_csv, print_results_summary, save_debug_info
-from login_handler import login_to_instagram
+from login_handler import login_to_instagram, load_session_cookies
 from page_navigator import navigate_to_post, find_comments_container
 from post_metadata_extractor import extract_post_metadata
 
 
+# Scroll budget that follows the post's reported comment count instead of a fixed number
+AUTO_SCROLLS = "auto"
+
+
+def parse_scroll_budget(value):
+    """
+    Parse a number_of_scrolls argument
+    
+    Args:
+        value (str): A non-negative integer or "auto"
+        
+    Returns:
+        int or str: Scroll count, or AUTO_SCROLLS
+        
+    Raises:
+        ValueError: If the value is neither
+    """
+    if str(value).lower() == AUTO_SCROLLS:
+        return AUTO_SCROLLS
+    num_scrolls = int(value)
+    if num_scrolls < 0:
+        raise ValueError("Number of scrolls must be non-negative")
+    return num_scrolls
+
+
+def parse_options(flags):
+    """
+    Parse --key=value / --key flags into a dict
+    
+    Args:
+        flags (list): Command line arguments starting with '--'
+        
+    Returns:
+        dict: Option names (without dashes) mapped to their values (True for bare flags)
+    """
+    options = {}
+    for flag in flags:
+        key, _, value = flag[2:].partition("=")
+        options[key] = value if value else True
+    return options
+
+
 def validate_arguments():
     """Validate command line arguments"""
-    if len(sys.argv) < 3 or len(sys.argv) > 4:
-        print("Usage: python main_scraper.py <instagram_post_url> <number_of_scrolls> [output_filename]")
+    positional = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    options = parse_options([arg for arg in sys.argv[1:] if arg.startswith("--")])
+    
+    if len(positional) < 2 or len(positional) > 3:
+        print("Usage: python main_scraper.py <instagram_post_url> <number_of_scrolls> [output_filename] [options]")
         print("Example: python main_scraper.py https://www.instagram.com/reel/ABC123/ 5")
         print("Example: python main_scraper.py https://www.instagram.com/reel/ABC123/ 5 my_comments.csv")
+        print(f"Example: python main_scraper.py https://www.instagram.com/reel/ABC123/ {AUTO_SCROLLS}  "
+              "(scroll until the post's comment count is reached or no new comments load)")
+        print("Options:")
+        print(f"  --engine=<{'|'.join(EXTRACTION_ENGINES)}>  Comment extraction engine (default: {ENGINE_SELENIUM})")
+        print("  --incremental  Only extract comment nodes added since the previous scroll")
+        print(f"  --scroll-wait=<seconds>  Max wait for new comments after each scroll (default: {SCROLL_WAIT_TIMEOUT})")
+        print("  --no-login  Skip the Instagram login (e.g. against mock_server.py)")
+        print("  --http  Fetch comments over plain HTTP first, fall back to the browser if that fails")
+        print("  --replies  Expand 'View replies' threads while scrolling and tag replies with their parent")
+        print(f"  --checkpoint-every=<scrolls>  Save progress every N scrolls, 0 to disable (default: {CHECKPOINT_EVERY})")
+        print("  --resume  Continue from this post's checkpoint instead of starting over")
+        print("  --lean  Block images, video and fonts and use eager page loads (see benchmarks.py profile)")
+        sys.exit(1)
+    
+    options.setdefault("engine", ENGINE_SELENIUM)
+    if options["engine"] not in EXTRACTION_ENGINES:
+        print(f"Invalid engine: {options['engine']} (choose from {', '.join(EXTRACTION_ENGINES)})")
+        sys.exit(1)
+    
+    try:
+        options["scroll-wait"] = float(options.get("scroll-wait", SCROLL_WAIT_TIMEOUT))
+        if options["scroll-wait"] <= 0:
+            raise ValueError("scroll wait must be positive")
+    except ValueError as e:
+        print(f"Invalid --scroll-wait: {e}")
+        sys.exit(1)
+    
+    try:
+        options["checkpoint-every"] = int(options.get("checkpoint-every", CHECKPOINT_EVERY))
+        if options["checkpoint-every"] < 0:
+            raise ValueError("checkpoint interval must be non-negative")
+    except ValueError as e:
+        print(f"Invalid --checkpoint-every: {e}")
         sys.exit(1)
     
     try:
-        num_scrolls = int(sys.argv[2])
-        if num_scrolls < 0:
-            raise ValueError("Number of scrolls must be non-negative")
+        num_scrolls = parse_scroll_budget(positional[1])
         
         # Optional filename parameter
-        filename = sys.argv[3] if len(sys.argv) == 4 else None
-        return sys.argv[1], num_scrolls, filename
+        filename = positional[2] if len(positional) == 3 else None
+        return positional[0], num_scrolls, filename, options
     except ValueError as e:
         print(f"Invalid number of scrolls: {e}")
         sys.exit(1)
 
 
+def scrape_post(driver, post_url, num_scrolls, custom_filename=None, options=None):
+    """
+    Scrape one post in an already set up (and logged-in) browser
+    
+    Navigates to the post, extracts metadata and comments, and exports them.
+    Errors are left to the caller, which owns the browser.
+    
+    Args:
+        driver: WebDriver instance
+        post_url (str): URL of the Instagram post
+        num_scrolls (int or str): Number of scroll iterations, or AUTO_SCROLLS to scroll until
+            the post's reported comment count is reached or new comments stop loading
+        custom_filename (str, optional): Output CSV filename
+        options (dict, optional): Options as returned by parse_options
+        
+    Returns:
+        CommentBatch or None: Extracted comments (only returned once they are in a CSV),
+            None if navigation failed
+        
+    Raises:
+        RuntimeError: If no CSV was written (no comments extracted or the export failed);
+            the checkpoint is kept so a retry can resume
+    """
+    options = options or {}
+    engine = options.get("engine", ENGINE_SELENIUM)
+    incremental = bool(options.get("incremental"))
+    
+    # Step 2: Navigate to post
+    if not navigate_to_post(driver, post_url):
+        print("Failed to navigate to post.")
+        return None
+    
+    # Initialize results (from the checkpoint when resuming)
+    checkpoint = ScrapeCheckpoint(post_url, int(options.get("checkpoint-every", CHECKPOINT_EVERY)))
+    restored = checkpoint.load() if options.get("resume") else None
+    if restored:
+        all_comments, processed_comments = restored
+    else:
+        all_comments = CommentBatch()
+        processed_comments = set()
+    
+    print(f"\n{'='*60}")
+    print("STEP-BY-STEP COMMENT EXTRACTION")
+    print(f"{'='*60}")
+    
+    # Step 3: Extract post metadata
+    post_metadata = extract_post_metadata(driver, post_url)
+    
+    # Auto budget: an exact og:description count is the target, the stall check covers hidden or
+    # deleted comments; a rounded "1.2K" count is no target at all, so only the stall check ends those
+    target_count, stall_scrolls = None, 0
+    if num_scrolls == AUTO_SCROLLS:
+        if post_metadata.get("comment_count_exact"):
+            target_count = post_metadata.get("comment_count")
+        stall_scrolls = AUTO_STALL_SCROLLS
+        num_scrolls = AUTO_MAX_SCROLLS
+    
+    scroll_wait = options.get("scroll-wait", SCROLL_WAIT_TIMEOUT)
+    
+    # Step 4: Find comments container (once the first comments have rendered)
+    if not wait_for_comments(driver, timeout=scroll_wait):
+        print("⚠️  No rendered comments yet, looking for the container anyway")
+    comments_container = find_comments_container(driver)
+    
+    # Step 5: Extract initial comments BEFORE scrolling
+    print("\nSTEP 2: Extracting initial comments...")
+    
+    # Create raw output file for debugging
+    # from datetime import datetime
+    # timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    # raw_output_file = f"raw_comments_{timestamp}.txt"
+    # print(f"Raw extraction data will be saved to: {raw_output_file}")
+    raw_output_file = None
+    
+    try:
+        initial_batch = extract_initial_comments(
+            driver, comments_container, processed_comments, raw_output_file, engine, incremental
+        )
+        
+        all_comments.extend(initial_batch)
+        
+        print(f"Initial extraction: {len(initial_batch)} comments")
+        
+        # Resuming: get back to where the previous run stopped without extracting on the way
+        if restored and comments_container and checkpoint.scroll_height:
+            fast_scroll_to(driver, comments_container, checkpoint.scroll_height, scroll_wait)
+        
+        # Step 6: Scroll and extract more comments if requested
+        if num_scrolls > checkpoint.scroll_index:
+            scroll_and_extract_comments(
+                driver, comments_container, num_scrolls, processed_comments, raw_output_file,
+                engine, incremental, scroll_wait, bool(options.get("replies")),
+                results=all_comments, checkpoint=checkpoint, start_scroll=checkpoint.scroll_index,
+                target_count=target_count, stall_scrolls=stall_scrolls
+            )
+    except Exception:
+        # Keep what was collected: checkpoint for --resume and a partial CSV
+        print(f"\n⚠️  Scrape failed at scroll {checkpoint.scroll_index}, saving partial results...")
+        checkpoint.save(all_comments, processed_comments)
+        export_to_csv(all_comments, custom_filename, post_metadata)
+        raise
+    
+    # Step 7: Print results and export
+    print_results_summary(all_comments)
+    csv_filename = export_to_csv(all_comments, custom_filename, post_metadata)
+    if not csv_filename:
+        raise RuntimeError(f"no CSV written for {post_url} ({len(all_comments)} comments extracted)")
+    checkpoint.clear()
+    return all_comments
+
+
 def main():
     """Main execution function"""
     # Load environment variables
     load_dotenv()
     
     # Validate arguments
-    post_url, num_scrolls, custom_filename = validate_arguments()
+    post_url, num_scrolls, custom_filename, options = validate_arguments()
+    
+    # Browserless path: page through the comments API, browser is the fallback
+    if options.get("http"):
+        # Reuse the browser login's cookies when a saved session exists
+        batch = fetch_comments(post_url, set(), create_session(load_session_cookies()))
+        if batch:
+            post_metadata = {
+                "post_url": post_url,
+                "post_type": "reel" if "/reel/" in post_url else "post",
+                "extraction_time": time.strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            print_results_summary(batch)
+            export_to_csv(batch, custom_filename, post_metadata)
+            return
+        print("HTTP fetch returned no comments, falling back to the browser")
     
     # Setup browser
-    driver, wait = setup_browser(headless=False)
+    driver, wait = setup_browser(headless=False, lean=bool(options.get("lean")))
     
     try:
         print(f"\n{'='*60}")
@@ -57,64 +266,13 @@ def main():
         print(f"{'='*60}")
         
         # Step 1: Login to Instagram
-        if not login_to_instagram(driver):
+        if options.get("no-login"):
+            print("Skipping login (--no-login)")
+        elif not login_to_instagram(driver):
             print("Login failed. Cannot proceed with scraping.")
             return
         
-        # Step 2: Navigate to post
-        if not navigate_to_post(driver, post_url):
-            print("Failed to navigate to post.")
-            return
-        
-        # Initialize results
-        all_usernames = []
-        all_comments = []
-        all_likes = []
-        processed_comments = set()
-        
-        print(f"\n{'='*60}")
-        print("STEP-BY-STEP COMMENT EXTRACTION")
-        print(f"{'='*60}")
-        
-        # Step 3: Extract post metadata
-        post_metadata = extract_post_metadata(driver, post_url)
-        
-        # Step 4: Find comments container
-        comments_container = find_comments_container(driver)
-        
-        # Step 5: Extract initial comments BEFORE scrolling
-        print("\nSTEP 2: Extracting initial comments...")
-        time.sleep(3)  # Let content settle
-        
-        # Create raw output file for debugging
-        # from datetime import datetime
-        # timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        # raw_output_file = f"raw_comments_{timestamp}.txt"
-        # print(f"Raw extraction data will be saved to: {raw_output_file}")
-        raw_output_file = None
-        
-        initial_names, initial_comments, initial_likes = extract_initial_comments(
-            driver, comments_container, processed_comments, raw_output_file
-        )
-        
-        all_usernames.extend(initial_names)
-        all_comments.extend(initial_comments)
-        all_likes.extend(initial_likes)
-        
-        print(f"Initial extraction: {len(initial_names)} comments")
-        
-        # Step 6: Scroll and extract more comments if requested
-        if num_scrolls > 0:
-            scroll_names, scroll_comments, scroll_likes = scroll_and_extract_comments(
-                driver, comments_container, num_scrolls, processed_comments, raw_output_file
-            )
-            all_usernames.extend(scroll_names)
-            all_comments.extend(scroll_comments)
-            all_likes.extend(scroll_likes)
-        
-        # Step 7: Print results and export
-        print_results_summary(all_usernames, all_comments)
-        export_to_csv(all_usernames, all_comments, all_likes, custom_filename, post_metadata)
+        scrape_post(driver, post_url, num_scrolls, custom_filename, options)
         
     except Exception as e:
         print(f"\nAn error occurred: {e}")
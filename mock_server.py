@@ -0,0 +1,486 @@
+"""
+Mock Instagram Server Module
+Local stand-in for the Instagram endpoints the scraper talks to, for offline testing and benchmarks.
+
+Serves:
+    /reel/<shortcode>/, /p/<shortcode>/, /<user>/reel/<shortcode>/
+        Post page with an Instagram-like comments container. The page's own
+        JavaScript fetches comment pages from the API below and renders them
+        as the user scrolls, like the real site does.
+    /api/v1/media/<media_id>/comments/?min_id=<cursor>
+        Comment pages. Either synthetic (deterministic per media id) or replayed
+        from saved response bodies (--replay DIR, *.json files chained by next_min_id).
+    /api/v1/users/web_profile_info/?username=<user>
+        Profile with the first page of the user's timeline (synthetic, newest first).
+    /graphql/query/?query_hash=<hash>&variables={"id": ..., "first": ..., "after": <cursor>}
+        Following timeline pages, in the same edge_owner_to_timeline_media shape.
+    /media/<name>
+        Large deterministic media files (the timeline's display_url / video_url), generated
+        chunk by chunk. Honours Range requests; can cut full responses short to test resuming.
+
+Usage:
+    python mock_server.py [--port 8000] [--comments 500] [--page-size 50] [--latency 0.3] [--replay DIR]
+                          [--posts 40] [--media-size 8388608] [--media-drop-after BYTES]
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from html import escape
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+
+DEFAULT_COMMENTS = 500
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_POSTS = 40
+TIMELINE_PAGE_SIZE = 12        # web_profile_info and the GraphQL query both return 12 posts a page
+TIMELINE_START = 1_735_689_600 # newest synthetic post (2025-01-01), older ones follow a day apart
+DEFAULT_MEDIA_SIZE = 8 * 1024 * 1024
+MEDIA_CHUNK_SIZE = 64 * 1024
+
+POST_PATH_PATTERN = re.compile(r"^/(?:[^/]+/)?(?:reel|p)/([A-Za-z0-9_-]+)/?$")
+COMMENTS_PATH_PATTERN = re.compile(r"^/api/v1/media/(\d+)/comments/?$")
+PROFILE_PATH = "/api/v1/users/web_profile_info/"
+GRAPHQL_PATH = "/graphql/query/"
+MEDIA_PATH_PATTERN = re.compile(r"^/media/([A-Za-z0-9_.-]+)$")
+RANGE_PATTERN = re.compile(r"^bytes=(\d+)-(\d*)$")
+
+POST_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head>
+<meta property="og:description" content="{like_count} likes, {comment_count} comments - mock_owner on January 1, 2025: &quot;Mock post {shortcode}&quot;">
+<title>Mock Instagram post {shortcode}</title>
+</head>
+<body>
+<article>
+<h1>Mock post {shortcode} caption used for metadata extraction tests</h1>
+<time datetime="2025-01-01T00:00:00.000Z">January 1, 2025</time>
+<div class="x5yr21d xw2csxc x1odjw0f x1n2onr6" style="height: 600px; overflow-y: scroll;"></div>
+</article>
+<script>
+(function () {{
+    var container = document.querySelector('div.x5yr21d');
+    var cursor = '';
+    var loading = false;
+    var done = false;
+
+    function el(tag, attrs, text) {{
+        var node = document.createElement(tag);
+        Object.keys(attrs || {{}}).forEach(function (key) {{ node.setAttribute(key, attrs[key]); }});
+        if (text) {{ node.textContent = text; }}
+        return node;
+    }}
+
+    function render(comment) {{
+        var block = el('div', {{'class': 'html-div x1comment'}});
+        var header = el('div', {{'class': 'html-div'}});
+        var link = el('a', {{href: '/' + comment.user.username + '/', role: 'link'}});
+        link.appendChild(el('span', {{dir: 'auto'}}, comment.user.username));
+        header.appendChild(link);
+        block.appendChild(header);
+        block.appendChild(el('span', {{dir: 'auto'}}, comment.text));
+        var footer = el('div', {{}});
+        var permalink = el('a', {{href: '/p/{shortcode}/c/' + comment.pk + '/'}});
+        permalink.appendChild(el('time', {{datetime: new Date(comment.created_at * 1000).toISOString()}}, '1w'));
+        footer.appendChild(permalink);
+        if (comment.comment_like_count) {{
+            footer.appendChild(el('span', {{}}, comment.comment_like_count + ' likes'));
+        }}
+        footer.appendChild(el('div', {{role: 'button', 'aria-label': 'Like'}}));
+        block.appendChild(footer);
+        container.appendChild(block);
+    }}
+
+    function loadMore() {{
+        if (loading || done) {{ return; }}
+        loading = true;
+        var url = '/api/v1/media/{media_id}/comments/?can_support_threading=true';
+        if (cursor) {{ url += '&min_id=' + encodeURIComponent(cursor); }}
+        fetch(url, {{headers: {{'X-IG-App-ID': '936619743392459'}}}})
+            .then(function (response) {{ return response.json(); }})
+            .then(function (data) {{
+                (data.comments || []).forEach(render);
+                cursor = data.next_min_id || '';
+                done = !cursor;
+                loading = false;
+            }});
+    }}
+
+    container.addEventListener('scroll', function () {{
+        if (container.scrollTop + container.clientHeight >= container.scrollHeight - 50) {{
+            loadMore();
+        }}
+    }});
+    loadMore();
+}})();
+</script>
+</body>
+</html>
+"""
+
+
+def synthetic_media_id(shortcode):
+    """
+    Derive a stable numeric media id for a shortcode (mock only, not Instagram's encoding)
+
+    Args:
+        shortcode (str): Post shortcode
+
+    Returns:
+        int: Media id
+    """
+    media_id = 0
+    for char in shortcode:
+        media_id = (media_id * 131 + ord(char)) % (10 ** 18)
+    return media_id or 1
+
+
+def synthetic_comments_page(media_id, cursor, total=DEFAULT_COMMENTS, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Build one page of synthetic comments in the API v1 response shape
+
+    Args:
+        media_id (int): Media id the comments belong to
+        cursor (str): Page cursor ('' for the first page)
+        total (int): Total number of comments on the post
+        page_size (int): Comments per page
+
+    Returns:
+        dict: Response body
+    """
+    start = int(cursor) if cursor else 0
+    end = min(start + page_size, total)
+    comments = []
+    for i in range(start, end):
+        comments.append({
+            "pk": str(17_800_000_000_000_000 + (media_id % 1_000_000) * 10_000 + i),
+            "text": f"Synthetic comment number {i} for media {media_id}",
+            "created_at": 1_735_689_600 + i * 60,
+            "comment_like_count": (i * 7) % 50,
+            "child_comment_count": 0,
+            "user": {"pk": str(1000 + i), "username": f"mock_user_{i}"},
+        })
+    return {
+        "comments": comments,
+        "comment_count": total,
+        "next_min_id": str(end) if end < total else None,
+        "has_more_headload_comments": end < total,
+        "status": "ok",
+    }
+
+
+def synthetic_user_id(username):
+    """
+    Derive a stable numeric user id for a username (mock only)
+
+    Args:
+        username (str): Account username
+
+    Returns:
+        str: User id
+    """
+    return str(synthetic_media_id(username) % 10 ** 10)
+
+
+def synthetic_timeline_page(username, cursor, total=DEFAULT_POSTS, page_size=TIMELINE_PAGE_SIZE,
+                            base_url=""):
+    """
+    Build one page of a user's synthetic timeline in the edge_owner_to_timeline_media shape
+
+    Every third post is a photo, the rest are reels; the newest post is pinned.
+
+    Args:
+        username (str): Account username
+        cursor (str): Page cursor ('' for the first page)
+        total (int): Total number of posts on the account
+        page_size (int): Posts per page
+        base_url (str): Server URL used for the media URLs
+
+    Returns:
+        dict: edge_owner_to_timeline_media object
+    """
+    start = int(cursor) if cursor else 0
+    end = min(start + page_size, total)
+    edges = []
+    for i in range(start, end):
+        shortcode = f"MOCK{synthetic_user_id(username)[-4:]}{i:04d}"
+        is_video = i % 3 != 0
+        edges.append({"node": {
+            "id": str(synthetic_media_id(shortcode)),
+            "shortcode": shortcode,
+            "is_video": is_video,
+            "taken_at_timestamp": TIMELINE_START - i * 86_400,
+            "pinned_for_users": [{"username": username}] if i == 0 else [],
+            "owner": {"id": synthetic_user_id(username), "username": username},
+            "display_url": f"{base_url}/media/{shortcode}.jpg",
+            "video_url": f"{base_url}/media/{shortcode}.mp4" if is_video else None,
+        }})
+    return {
+        "count": total,
+        "page_info": {"has_next_page": end < total, "end_cursor": str(end) if end < total else None},
+        "edges": edges,
+    }
+
+
+def synthetic_media_bytes(name, start, end):
+    """
+    Bytes start..end (exclusive) of a synthetic media file; any range can be produced without the rest
+
+    Args:
+        name (str): Media file name
+        start (int): First byte offset
+        end (int): Offset after the last byte
+
+    Returns:
+        bytes: File content in that range
+    """
+    pattern = hashlib.sha256(name.encode("utf-8")).digest()
+    repeated = pattern * ((end - start) // len(pattern) + 2)
+    skip = start % len(pattern)
+    return repeated[skip:skip + end - start]
+
+
+def load_replay_pages(replay_dir):
+    """
+    Load saved comment response bodies and chain them by their next_min_id
+
+    The first file (sorted by name) answers the request without a cursor; each
+    following file answers the cursor named by the previous file's next_min_id.
+
+    Args:
+        replay_dir (str): Directory with saved *.json response bodies
+
+    Returns:
+        dict: Cursor ('' for the first page) mapped to the response body
+    """
+    pages = {}
+    cursor = ""
+    for path in sorted(glob.glob(os.path.join(replay_dir, "*.json"))):
+        with open(path, 'r', encoding='utf-8') as f:
+            body = json.load(f)
+        pages[cursor] = body
+        cursor = str(body.get("next_min_id") or "")
+        if not cursor:
+            break
+    return pages
+
+
+class MockInstagramHandler(BaseHTTPRequestHandler):
+    """Routes requests to the mock endpoints; configured through the server attributes"""
+
+    # Keep-alive like the real site, so pooled clients reuse their connections
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without TCP_NODELAY each kept-alive
+    # response stalls on the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        post_match = POST_PATH_PATTERN.match(parsed.path)
+        if post_match:
+            self._send_post_page(post_match.group(1))
+            return
+
+        comments_match = COMMENTS_PATH_PATTERN.match(parsed.path)
+        if comments_match:
+            cursor = query.get("min_id", [""])[0]
+            self._send_comments_page(int(comments_match.group(1)), cursor)
+            return
+
+        if parsed.path == PROFILE_PATH:
+            self._send_profile(query.get("username", [""])[0])
+            return
+
+        if parsed.path == GRAPHQL_PATH:
+            self._send_timeline_page(query.get("variables", ["{}"])[0])
+            return
+
+        media_match = MEDIA_PATH_PATTERN.match(parsed.path)
+        if media_match:
+            self._send_media(media_match.group(1))
+            return
+
+        self._send_json({"status": "fail", "message": "not found"}, status=404)
+
+    def _send_post_page(self, shortcode):
+        media_id = synthetic_media_id(shortcode)
+        page = POST_PAGE_TEMPLATE.format(
+            shortcode=escape(shortcode),
+            media_id=media_id,
+            like_count=1000 + media_id % 9000,
+            comment_count=self.server.total_comments,
+        )
+        self._send(page.encode('utf-8'), "text/html; charset=utf-8")
+
+    def _send_comments_page(self, media_id, cursor):
+        self.server.comment_requests += 1
+        if self.server.replay_pages is not None:
+            body = self.server.replay_pages.get(cursor)
+            if body is None:
+                self._send_json({"status": "fail", "message": "unknown cursor"}, status=400)
+                return
+        else:
+            body = synthetic_comments_page(media_id, cursor, self.server.total_comments, self.server.page_size)
+        self._send_json(body)
+
+    def _send_profile(self, username):
+        if not username:
+            self._send_json({"status": "fail", "message": "username required"}, status=400)
+            return
+        self.server.profile_requests += 1
+        self.server.known_users[synthetic_user_id(username)] = username
+        self._send_json({"data": {"user": {
+            "id": synthetic_user_id(username),
+            "username": username,
+            "is_private": False,
+            "edge_owner_to_timeline_media": synthetic_timeline_page(
+                username, "", self.server.total_posts, base_url=self._base_url()
+            ),
+        }}, "status": "ok"})
+
+    def _send_timeline_page(self, variables):
+        try:
+            variables = json.loads(variables)
+            user_id = str(variables["id"])
+        except (ValueError, KeyError, TypeError):
+            self._send_json({"status": "fail", "message": "bad variables"}, status=400)
+            return
+        self.server.timeline_requests += 1
+        # Ids can't be turned back into usernames, so remember the ones handed out by _send_profile
+        username = self.server.known_users.get(user_id, f"user_{user_id}")
+        timeline = synthetic_timeline_page(
+            username, variables.get("after") or "", self.server.total_posts,
+            min(int(variables.get("first", TIMELINE_PAGE_SIZE)), 50), self._base_url()
+        )
+        self._send_json({"data": {"user": {"edge_owner_to_timeline_media": timeline}}, "status": "ok"})
+
+    def _send_media(self, name):
+        self.server.media_requests.append(self.headers.get("Range"))
+        total = self.server.media_size
+        start, end = 0, total
+        status = 200
+
+        range_header = self.headers.get("Range")
+        if range_header:
+            match = RANGE_PATTERN.match(range_header.strip())
+            if not match or int(match.group(1)) >= total:
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{total}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            start = int(match.group(1))
+            end = min(int(match.group(2)) + 1, total) if match.group(2) else total
+            status = 206
+
+        self.send_response(status)
+        self.send_header("Content-Type", "video/mp4" if name.endswith(".mp4") else "image/jpeg")
+        self.send_header("Content-Length", str(end - start))
+        self.send_header("Accept-Ranges", "bytes")
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end - 1}/{total}")
+        self.end_headers()
+
+        # Full responses can be cut short to simulate a dropped connection
+        drop_after = self.server.media_drop_after if status == 200 else None
+        for offset in range(start, end, MEDIA_CHUNK_SIZE):
+            chunk_end = min(offset + MEDIA_CHUNK_SIZE, end)
+            if drop_after is not None and chunk_end - start > drop_after:
+                self.close_connection = True
+                return
+            self.wfile.write(synthetic_media_bytes(name, offset, chunk_end))
+
+    def _base_url(self):
+        return f"http://{self.headers.get('Host') or '127.0.0.1:%d' % self.server.server_address[1]}"
+
+    def _send_json(self, body, status=200):
+        self._send(json.dumps(body).encode('utf-8'), "application/json; charset=utf-8", status)
+
+    def _send(self, payload, content_type, status=200):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def start_mock_server(port=0, total_comments=DEFAULT_COMMENTS, page_size=DEFAULT_PAGE_SIZE,
+                      latency=0.0, replay_dir=None, verbose=False, total_posts=DEFAULT_POSTS,
+                      media_size=DEFAULT_MEDIA_SIZE, media_drop_after=None):
+    """
+    Start the mock server on a background thread
+
+    Args:
+        port (int): Port to listen on (0 picks a free one)
+        total_comments (int): Synthetic comments per post
+        page_size (int): Synthetic comments per page
+        latency (float): Artificial delay in seconds added to every response
+        replay_dir (str, optional): Directory of saved comment bodies to replay instead
+        verbose (bool): Log every request
+        total_posts (int): Synthetic timeline posts per user
+        media_size (int): Size in bytes of every /media/ file
+        media_drop_after (int, optional): Close full (non-Range) media responses after about this many bytes
+
+    Returns:
+        tuple: (server, base_url) - call server.shutdown() when done
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), MockInstagramHandler)
+    server.daemon_threads = True
+    server.total_comments = total_comments
+    server.page_size = page_size
+    server.latency = latency
+    server.replay_pages = load_replay_pages(replay_dir) if replay_dir else None
+    server.verbose = verbose
+    server.comment_requests = 0
+    server.total_posts = total_posts
+    server.known_users = {}
+    server.profile_requests = 0
+    server.timeline_requests = 0
+    server.media_size = media_size
+    server.media_drop_after = media_drop_after
+    server.media_requests = []  # Range header of every media request (None for full downloads)
+
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local stand-in for the Instagram endpoints used by the scraper")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--comments", type=int, default=DEFAULT_COMMENTS, help="synthetic comments per post")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE, help="synthetic comments per page")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--replay", metavar="DIR", help="replay saved comment response bodies from DIR")
+    parser.add_argument("--posts", type=int, default=DEFAULT_POSTS, help="synthetic timeline posts per user")
+    parser.add_argument("--media-size", type=int, default=DEFAULT_MEDIA_SIZE, help="bytes per /media/ file")
+    parser.add_argument("--media-drop-after", type=int, metavar="BYTES",
+                        help="cut full media responses short after this many bytes")
+    args = parser.parse_args()
+
+    server, base_url = start_mock_server(args.port, args.comments, args.page_size, args.latency,
+                                         args.replay, verbose=True, total_posts=args.posts,
+                                         media_size=args.media_size, media_drop_after=args.media_drop_after)
+    print(f"Mock Instagram server running at {base_url}")
+    print(f"Example post: {base_url}/reel/MOCKPOST123/")
+    print(f"Example profile: {base_url}{PROFILE_PATH}?username=mock_owner")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
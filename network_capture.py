@@ -0,0 +1,273 @@
+"""
+Network Capture Module
+Reads comments from the JSON responses the post page downloads for comment pagination,
+instead of scraping the rendered DOM.
+
+Usage (parse saved response bodies offline):
+    python network_capture.py <response.json> [<response.json> ...]
+"""
+
+import json
+import sys
+
+from comment_batch import CommentBatch
+from comment_extractor import _add_unique_comment
+from text_validator import is_valid_username_comment_pair
+
+
+# Payload keys holding text+user objects that are not comments (the post caption)
+_NON_COMMENT_KEYS = {"caption", "edge_media_to_caption"}
+
+# Wraps window.fetch and XMLHttpRequest once per page and buffers the bodies of
+# comment-related responses in window.__igCapture until they are drained.
+CAPTURE_HOOK_SCRIPT = """
+if (!window.__igCapture) {
+    window.__igCapture = [];
+    var matches = function (url) {
+        return /\\/comments\\/|\\/graphql/.test(String(url || ''));
+    };
+    var keep = function (url, text) {
+        if (text && text.indexOf('"text"') !== -1) {
+            window.__igCapture.push({url: String(url), body: text});
+        }
+    };
+
+    var originalFetch = window.fetch;
+    window.fetch = function (input) {
+        var url = input && input.url ? input.url : input;
+        return originalFetch.apply(this, arguments).then(function (response) {
+            if (matches(url)) {
+                response.clone().text().then(function (text) { keep(url, text); }, function () {});
+            }
+            return response;
+        });
+    };
+
+    var originalOpen = XMLHttpRequest.prototype.open;
+    XMLHttpRequest.prototype.open = function (method, url) {
+        this.__igUrl = url;
+        return originalOpen.apply(this, arguments);
+    };
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        var xhr = this;
+        if (matches(xhr.__igUrl)) {
+            xhr.addEventListener('load', function () {
+                try {
+                    var text = xhr.responseType === 'json' ? JSON.stringify(xhr.response) : xhr.responseText;
+                    keep(xhr.__igUrl, text);
+                } catch (e) {}
+            });
+        }
+        return originalSend.apply(this, arguments);
+    };
+}
+return true;
+"""
+
+DRAIN_CAPTURE_SCRIPT = """
+var captured = window.__igCapture || [];
+if (window.__igCapture) {
+    window.__igCapture = [];
+}
+return captured;
+"""
+
+
+def install_capture_hook(driver):
+    """
+    Install the fetch/XHR capture hook in the current page (no-op if already installed)
+
+    Args:
+        driver: WebDriver instance
+
+    Returns:
+        bool: True if the hook is in place, False otherwise
+    """
+    try:
+        driver.execute_script(CAPTURE_HOOK_SCRIPT)
+        print("📡 Network capture hook installed")
+        return True
+    except Exception as e:
+        print(f"Could not install network capture hook: {e}")
+        return False
+
+
+def drain_captured_responses(driver):
+    """
+    Take the response bodies captured since the last drain
+
+    Args:
+        driver: WebDriver instance
+
+    Returns:
+        list: Decoded JSON payloads
+    """
+    payloads = []
+    for entry in driver.execute_script(DRAIN_CAPTURE_SCRIPT) or []:
+        payload = parse_response_body(entry.get("body", ""))
+        if payload is not None:
+            payloads.append(payload)
+    return payloads
+
+
+def parse_response_body(body):
+    """
+    Decode a captured response body (tolerates anti-JSON-hijacking prefixes like 'for (;;);')
+
+    Args:
+        body (str): Raw response text
+
+    Returns:
+        dict/list or None: Decoded JSON, None if the body is not JSON
+    """
+    if not body:
+        return None
+    start = min((i for i in (body.find("{"), body.find("[")) if i != -1), default=-1)
+    if start == -1:
+        return None
+    try:
+        return json.loads(body[start:])
+    except ValueError:
+        return None
+
+
+def parse_comment_payload(payload):
+    """
+    Pull comment records out of an API v1 or GraphQL comments payload
+
+    Walks the whole document, so nested shapes (GraphQL edges/node, preview
+    child comments) are picked up without knowing the exact schema.
+
+    Args:
+        payload: Decoded JSON response
+
+    Returns:
+        list: Dicts with comment_id, username, text, likes, created_at and parent_id
+    """
+    records = []
+    stack = [(payload, None)]
+
+    while stack:
+        node, parent_id = stack.pop()
+        if isinstance(node, list):
+            stack.extend((item, parent_id) for item in reversed(node))
+            continue
+        if not isinstance(node, dict):
+            continue
+
+        record = _comment_record(node, parent_id)
+        if record:
+            records.append(record)
+            parent_id = record["comment_id"] or parent_id
+
+        stack.extend((value, parent_id) for key, value in reversed(list(node.items()))
+                     if isinstance(value, (dict, list)) and key not in _NON_COMMENT_KEYS)
+
+    return records
+
+
+def _comment_record(node, parent_id):
+    """
+    Build a comment record from a payload node if it looks like a comment
+
+    Args:
+        node (dict): Payload node
+        parent_id (str): Id of the enclosing comment, if any
+
+    Returns:
+        dict or None: Comment record, None if the node is not a comment
+    """
+    user = node.get("user") or node.get("owner")
+    text = node.get("text")
+    if not isinstance(text, str) or not isinstance(user, dict) or not user.get("username"):
+        return None
+
+    comment_id = node.get("pk") or node.get("id")
+    likes = node.get("comment_like_count")
+    if likes is None:
+        likes = node.get("like_count")
+    if likes is None:
+        likes = (node.get("edge_liked_by") or {}).get("count", 0)
+    created_at = node.get("created_at") or node.get("created_at_utc")
+
+    return {
+        "comment_id": str(comment_id) if comment_id else None,
+        "username": user["username"],
+        "text": text,
+        "likes": int(likes or 0),
+        "created_at": int(created_at) if isinstance(created_at, (int, float)) and created_at else None,
+        "parent_id": str(node.get("parent_comment_id") or parent_id or "") or None,
+    }
+
+
+def tag_replies(records, comment_authors):
+    """
+    Resolve each record's parent_id to the parent's username (reply_to)
+
+    Args:
+        records (list): Records from parse_comment_payload
+        comment_authors (dict): Comment id -> username, updated with these records
+            and kept by the caller across payloads
+
+    Returns:
+        list: The same records, each with a reply_to key (None for top-level comments
+            and for replies whose parent was never seen)
+    """
+    comment_authors.update((record["comment_id"], record["username"]) for record in records if record["comment_id"])
+    for record in records:
+        record["reply_to"] = comment_authors.get(record["parent_id"]) if record["parent_id"] else None
+    return records
+
+
+def extract_comments_from_network(driver, processed_comments, raw_output_file=None, comment_authors=None):
+    """
+    Extract comments from the responses captured since the last call
+
+    Args:
+        driver: WebDriver instance
+        processed_comments (set): Set to track processed comments
+        raw_output_file (str, optional): Path to file for writing raw comments
+        comment_authors (dict, optional): Comment id -> username, kept by the caller for the
+            whole scrape so replies to comments from earlier payloads are tagged too
+
+    Returns:
+        CommentBatch: Extracted comments
+    """
+    batch = CommentBatch()
+    comment_authors = {} if comment_authors is None else comment_authors
+
+    try:
+        payloads = drain_captured_responses(driver)
+        records = [record for payload in payloads for record in parse_comment_payload(payload)]
+        tag_replies(records, comment_authors)
+        print(f"  📡 Captured {len(payloads)} responses with {len(records)} comment records")
+
+        for record in records:
+            username, text = record["username"], record["text"]
+            if not is_valid_username_comment_pair(username, text):
+                continue
+            if _add_unique_comment(username, text, processed_comments, batch, record["likes"],
+                                   comment_id=record["comment_id"], reply_to=record["reply_to"],
+                                   created_at=record["created_at"]):
+                likes_display = f" ({record['likes']} likes)" if record["likes"] > 0 else ""
+                print(f"  {username}: {text[:60]}...{likes_display}")
+
+    except Exception as e:
+        print(f"  Error extracting from captured responses: {e}")
+
+    return batch
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python network_capture.py <response.json> [<response.json> ...]")
+        sys.exit(1)
+
+    for path in sys.argv[1:]:
+        with open(path, 'r', encoding='utf-8') as f:
+            parsed = parse_response_body(f.read())
+        found = parse_comment_payload(parsed) if parsed is not None else []
+        print(f"{path}: {len(found)} comments")
+        for item in found:
+            print(f"  [{item['comment_id']}] {item['username']}: {item['text'][:60]} ({item['likes']} likes)")
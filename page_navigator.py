@@ -3,12 +3,37 @@ Page Navigator Module
 Handles navigation and page element discovery.
 """
 
-import time
+from urllib.parse import urlparse
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
 
+PAGE_WAIT_TIMEOUT = 10      # seconds to wait for the post's article
+PAGE_POLL_INTERVAL = 0.2    # seconds
+
+
+def wait_for_article(driver, timeout=PAGE_WAIT_TIMEOUT):
+    """
+    Wait for the post's article element instead of a fixed delay
+    
+    Args:
+        driver: WebDriver instance
+        timeout (float): Maximum number of seconds to wait
+        
+    Returns:
+        bool: True if the article is present, False on timeout
+    """
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=PAGE_POLL_INTERVAL).until(
+            EC.presence_of_element_located((By.TAG_NAME, "article"))
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
 def navigate_to_post(driver, post_url):
     """
     Navigate to the Instagram post and wait for it to load
@@ -22,11 +47,11 @@ def navigate_to_post(driver, post_url):
     """
     print(f"Navigating to post: {post_url}")
     driver.get(post_url)
-    time.sleep(5)
+    article_loaded = wait_for_article(driver)
     
-    # Check if we successfully navigated (basic check)
+    # Check if we successfully navigated (basic check, same host as the post URL)
     current_url = driver.current_url
-    if "instagram.com" not in current_url:
+    if urlparse(post_url).netloc not in current_url:
         print("Failed to navigate to Instagram")
         return False
     
@@ -41,20 +66,17 @@ def navigate_to_post(driver, post_url):
             clean_url = post_url.split("?")[0]
             print(f"🔄 Trying clean URL: {clean_url}")
             driver.get(clean_url)
-            time.sleep(5)
+            article_loaded = wait_for_article(driver)
             current_url = driver.current_url
             
             if "/reel/" not in current_url:
                 print("❌ Still redirected to account page - reel may not exist or be private")
                 return False
     
-    # Try to find article element but don't fail if not found
-    try:
-        WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.TAG_NAME, "article"))
-        )
+    # Don't fail if the article never showed up
+    if article_loaded:
         print("Article loaded successfully")
-    except:
+    else:
         print("Warning: Could not find article element, but proceeding anyway")
     
     print("✅ Navigation completed successfully")
@@ -0,0 +1,209 @@
+"""
+Parallel Runner Module
+Scrapes a list of posts across several worker processes, each with its own logged-in browser.
+
+Usage:
+    python parallel_runner.py <jobs_file> [--workers=4] [--headed] [options]
+    python parallel_runner.py --mock=8 [--workers=4] [--mock-comments=300] [options]
+
+jobs_file has one job per line, like the commands in run_multiple.sh:
+    <post_url> [number_of_scrolls|auto] [output_filename]
+--mock starts mock_server.py locally and points that many mock posts at the worker pool
+without logging in. It has not yet been run with Firefox against the mock pages.
+Other options are the same as main_scraper.py (--engine, --incremental, --scroll-wait, ...).
+Each worker logs to worker_logs/worker_<n>.log; progress for all workers is printed here.
+"""
+
+import multiprocessing
+import os
+import queue
+import sys
+import time
+from contextlib import redirect_stdout
+
+from dotenv import load_dotenv
+
+from main_scraper import parse_options, parse_scroll_budget
+from session_runner import ScraperSession
+
+
+DEFAULT_WORKERS = 4
+DEFAULT_SCROLLS = 70
+WORKER_LOG_DIR = "worker_logs"
+LOGIN_STAGGER = 5.0        # seconds between worker start-ups, so logins don't arrive all at once
+RESULT_POLL_INTERVAL = 1.0 # seconds
+
+
+def read_jobs(path, default_scrolls=DEFAULT_SCROLLS):
+    """
+    Read scrape jobs from a file (blank lines and # comments skipped)
+
+    Args:
+        path (str): Path to the jobs file
+        default_scrolls (int): Scroll count for lines that omit it
+
+    Returns:
+        list: (post_url, num_scrolls, output_filename or None) tuples
+    """
+    jobs = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            parts = line.split()
+            if not parts or parts[0].startswith("#"):
+                continue
+            num_scrolls = parse_scroll_budget(parts[1]) if len(parts) > 1 else default_scrolls
+            jobs.append((parts[0], num_scrolls, parts[2] if len(parts) > 2 else None))
+    return jobs
+
+
+def _worker(worker_id, job_queue, result_queue, options, headless, log_dir):
+    """
+    Worker process: one browser session, jobs pulled from the shared queue until a None sentinel
+
+    Args:
+        worker_id (int): Worker number (1-based)
+        job_queue: Shared queue of (post_url, num_scrolls, output_filename) jobs
+        result_queue: Queue for (worker_id, post_url, comment count or None, seconds, output_filename)
+        options (dict): Options as returned by main_scraper.parse_options
+        headless (bool): Run the browser headless
+        log_dir (str): Directory for the worker's log file
+    """
+    log_path = os.path.join(log_dir, f"worker_{worker_id}.log")
+    with open(log_path, 'a', encoding='utf-8', buffering=1) as log, redirect_stdout(log):
+        print(f"=== Worker {worker_id} started at {time.strftime('%Y-%m-%d %H:%M:%S')} ===")
+        with ScraperSession(headless, not options.get("no-login"), bool(options.get("lean"))) as session:
+            while True:
+                job = job_queue.get()
+                if job is None:
+                    break
+
+                post_url, num_scrolls, filename = job
+                start_time = time.perf_counter()
+                try:
+                    batch = session.scrape(post_url, num_scrolls, filename, options)
+                except Exception as e:
+                    print(f"Job failed: {e}")
+                    batch = None
+                count = len(batch) if batch is not None else None
+                result_queue.put((worker_id, post_url, count, time.perf_counter() - start_time, filename))
+
+
+def run_parallel(jobs, workers=DEFAULT_WORKERS, options=None, headless=True, log_dir=WORKER_LOG_DIR,
+                 stagger=LOGIN_STAGGER):
+    """
+    Scrape jobs across worker processes and print combined progress
+
+    Args:
+        jobs (list): (post_url, num_scrolls, output_filename) tuples; a None filename gets post_<n>.csv
+        workers (int): Number of worker processes (each runs one browser)
+        options (dict, optional): Options as returned by main_scraper.parse_options
+        headless (bool): Run the browsers headless
+        log_dir (str): Directory for per-worker log files
+        stagger (float): Seconds between worker start-ups
+
+    Returns:
+        list: (worker_id, post_url, comment count or None, seconds, output_filename) per finished job
+    """
+    options = options or {}
+    workers = max(1, min(workers, len(jobs)))
+    os.makedirs(log_dir, exist_ok=True)
+
+    job_queue = multiprocessing.Queue()
+    result_queue = multiprocessing.Queue()
+    for idx, (post_url, num_scrolls, filename) in enumerate(jobs):
+        job_queue.put((post_url, num_scrolls, filename or f"post_{idx+1}.csv"))
+    for _ in range(workers):
+        job_queue.put(None)
+
+    print(f"🚀 Scraping {len(jobs)} posts with {workers} workers (logs in {log_dir}/)")
+    run_start = time.perf_counter()
+    processes = []
+    for worker_id in range(1, workers + 1):
+        process = multiprocessing.Process(
+            target=_worker, args=(worker_id, job_queue, result_queue, options, headless, log_dir)
+        )
+        process.start()
+        processes.append(process)
+        if stagger and worker_id < workers:
+            time.sleep(stagger)
+
+    results = []
+    while len(results) < len(jobs):
+        try:
+            result = result_queue.get(timeout=RESULT_POLL_INTERVAL)
+        except queue.Empty:
+            if not any(process.is_alive() for process in processes):
+                print("❌ All workers exited before finishing the queue")
+                break
+            continue
+
+        results.append(result)
+        worker_id, post_url, count, elapsed, filename = result
+        status = f"{count} comments -> {filename}" if count is not None else "FAILED"
+        print(f"  [{len(results)}/{len(jobs)}] worker {worker_id}: {post_url} {status} ({elapsed:.1f}s)")
+
+    for process in processes:
+        process.join()
+
+    total_time = time.perf_counter() - run_start
+    failed = sum(1 for result in results if result[2] is None)
+    total_comments = sum(result[2] or 0 for result in results)
+    busy_time = sum(result[3] for result in results)
+    print(f"\n{'='*60}")
+    print(f"PARALLEL RUN DONE: {len(results) - failed}/{len(jobs)} posts, {total_comments} comments "
+          f"in {total_time:.1f}s wall time ({busy_time:.1f}s of scraping, "
+          f"{busy_time / total_time if total_time else 0:.1f}x speed-up)")
+    print(f"{'='*60}")
+    return results
+
+
+def run_mock(num_posts, workers=DEFAULT_WORKERS, options=None, num_scrolls=10, total_comments=300,
+             headless=True):
+    """
+    Run the worker pool against a local mock_server.py instance (no login)
+
+    Exercises the job queue, worker start-up and progress reporting; scraping the
+    mock pages has not been verified with a real Firefox yet.
+
+    Args:
+        num_posts (int): Number of mock posts to scrape
+        workers (int): Number of worker processes
+        options (dict, optional): Options as returned by main_scraper.parse_options
+        num_scrolls (int): Scrolls per post
+        total_comments (int): Synthetic comments per mock post
+        headless (bool): Run the browsers headless
+
+    Returns:
+        list: Job results as returned by run_parallel
+    """
+    from mock_server import start_mock_server
+
+    server, base_url = start_mock_server(total_comments=total_comments, latency=0.2)
+    try:
+        jobs = [(f"{base_url}/reel/MOCK{i:04d}/", num_scrolls, f"mock_post_{i+1}.csv") for i in range(num_posts)]
+        return run_parallel(jobs, workers, dict(options or {}, **{"no-login": True}), headless, stagger=0)
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    positional = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    cli_options = parse_options([arg for arg in sys.argv[1:] if arg.startswith("--")])
+    num_workers = int(cli_options.pop("workers", DEFAULT_WORKERS))
+    run_headless = not cli_options.pop("headed", False)
+    if "scroll-wait" in cli_options:
+        cli_options["scroll-wait"] = float(cli_options["scroll-wait"])
+
+    if "mock" in cli_options:
+        mock_posts = cli_options.pop("mock")
+        mock_comments = int(cli_options.pop("mock-comments", 300))
+        run_mock(8 if mock_posts is True else int(mock_posts), num_workers, cli_options,
+                 total_comments=mock_comments, headless=run_headless)
+    elif len(positional) == 1:
+        run_parallel(read_jobs(positional[0]), num_workers, cli_options, run_headless)
+    else:
+        print("Usage: python parallel_runner.py <jobs_file> [--workers=4] [--headed] [options]")
+        print("       python parallel_runner.py --mock=8 [--workers=4] [--mock-comments=300] [options]")
+        sys.exit(1)
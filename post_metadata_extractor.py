@@ -3,7 +3,7 @@ Post Metadata Extractor Module
 Handles extraction of post caption, date, and other metadata from Instagram pages.
 """
 
-import time
+import re
 from datetime import datetime
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -11,6 +11,69 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
 
+# og:description starts with the post's counts: "24K likes, 58 comments - doobydobap on ..."
+# (anchored, so a caption that merely mentions "3 comments" doesn't count)
+COMMENT_COUNT_PATTERN = re.compile(
+    r'^\s*(?:[\d,.]+\s*[KMB]?\s+likes?,\s*)?(\d[\d,.]*)\s*([KMB])?\s+comments?\b', re.IGNORECASE
+)
+COUNT_SUFFIXES = {'k': 1000, 'm': 1000000, 'b': 1000000000}
+
+METADATA_WAIT_TIMEOUT = 5  # seconds to wait for the og:description tag
+
+
+def parse_comment_count(text):
+    """
+    Parse the comment count out of an og:description style summary
+    
+    The count is Instagram's total for the post, replies included, so it is only
+    reached when reply threads are expanded as well.
+    
+    Args:
+        text (str): Text such as "24K likes, 58 comments - user on ..."
+        
+    Returns:
+        tuple: (count, exact) - count is an int or None if not present; exact is False
+            for rounded "1.2K"-style counts, which only give the order of magnitude
+    """
+    match = COMMENT_COUNT_PATTERN.search(text or "")
+    if not match:
+        return None, False
+    
+    number, suffix = match.groups()
+    try:
+        count = int(float(number.replace(',', '')) * COUNT_SUFFIXES.get((suffix or '').lower(), 1))
+    except ValueError:
+        return None, False
+    return count, not suffix
+
+
+def extract_comment_count(driver, caption=""):
+    """
+    Extract the post's comment count (replies included) from the og:description meta tag
+    
+    Args:
+        driver: WebDriver instance
+        caption (str): Already extracted caption, used when the meta tag is missing
+        
+    Returns:
+        tuple: (count, exact) as returned by parse_comment_count
+    """
+    try:
+        description = driver.find_element(By.CSS_SELECTOR, "meta[property='og:description']").get_attribute("content")
+    except NoSuchElementException:
+        description = ""
+    
+    count, exact = parse_comment_count(description) if description else (None, False)
+    if count is None:
+        count, exact = parse_comment_count(caption)
+    
+    if count is None:
+        print("❌ Could not find comment count")
+    else:
+        print(f"✅ Post reports {count if exact else f'~{count}'} comments")
+    return count, exact
+
+
 def extract_post_caption(driver):
     """
     Extract the post caption/description
@@ -146,8 +209,13 @@ def extract_post_metadata(driver, post_url):
     print("EXTRACTING POST METADATA")
     print(f"{'='*50}")
     
-    # Wait a moment for page to fully load
-    time.sleep(2)
+    # The og:description tag carries the counts; wait for it rather than a fixed delay
+    try:
+        WebDriverWait(driver, METADATA_WAIT_TIMEOUT, poll_frequency=0.2).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "meta[property='og:description']"))
+        )
+    except TimeoutException:
+        print("⚠️  og:description meta tag not found, extracting what is there")
     
     metadata = {
         "post_url": post_url,
@@ -162,6 +230,9 @@ def extract_post_metadata(driver, post_url):
     # Extract date
     metadata["date"] = extract_post_date(driver)
     
+    # Expected number of comments (drives the auto scroll budget)
+    metadata["comment_count"], metadata["comment_count_exact"] = extract_comment_count(driver, metadata["caption"])
+    
     # Additional metadata we could extract
     try:
         # Try to get post type (photo, video, reel, etc.)
@@ -178,6 +249,10 @@ def extract_post_metadata(driver, post_url):
     print(f"   Type: {metadata['post_type']}")
     print(f"   Caption: {'✅ Found' if metadata['caption'] else '❌ Not found'}")
     print(f"   Date: {'✅ Found' if metadata['date'] else '❌ Not found'}")
+    if metadata["comment_count"] is None:
+        print("   Comments: ❌ Not found")
+    else:
+        print(f"   Comments: {'' if metadata['comment_count_exact'] else '~'}{metadata['comment_count']}")
     print(f"   Extracted at: {metadata['extraction_time']}")
     
     return metadata
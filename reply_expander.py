@@ -0,0 +1,207 @@
+"""
+Reply Expander Module
+Expands "View replies" threads in batches and extracts the replies tagged with their parent comment.
+"""
+
+import time
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+from comment_batch import CommentBatch
+from comment_extractor import (
+    _JS_COMMENT_HELPERS, _pick_comment_text, _likes_from_texts, _add_unique_comment,
+    SCROLL_WAIT_TIMEOUT, SCROLL_POLL_INTERVAL
+)
+from text_validator import is_valid_text, is_valid_username_comment_pair, FOOTER_TERMS
+
+
+# "View replies (3)", "View all 12 replies", "View more replies (7)"
+_JS_REPLY_HELPERS = """
+var REPLY_BUTTON = /^view (all |more )?(\\d+ )?(more )?repl(y|ies)/i;
+
+function replyButtons(container) {
+    var buttons = [];
+    container.querySelectorAll("button, [role='button'], span").forEach(function (el) {
+        var text = (el.innerText || '').trim();
+        if (!REPLY_BUTTON.test(text)) {
+            return;
+        }
+        if (el.tagName === 'SPAN' && el.closest("button, [role='button']")) {
+            return;
+        }
+        buttons.push(el);
+    });
+    return buttons;
+}
+
+function isProfileLink(link) {
+    return /^\/[^\/]+\/?$/.test(link.getAttribute('href') || '');
+}
+
+function threadRoot(button, container) {
+    // Closest ancestor that also holds the parent comment's username link. It only
+    // counts when everything before the button belongs to one comment block;
+    // otherwise we walked up into the comment list and cannot tell the parent.
+    var stamped = button.closest('[data-ig-reply-parent]');
+    if (stamped && container.contains(stamped)) {
+        return null;
+    }
+    var node = button.parentElement;
+    while (node && node !== container.parentElement) {
+        var links = findUsernameLinks(node, false).filter(isProfileLink);
+        if (links.length) {
+            var blocks = [];
+            links.forEach(function (link) {
+                var block = findCommentParent(link);
+                if ((link.compareDocumentPosition(button) & Node.DOCUMENT_POSITION_FOLLOWING) &&
+                        blocks.indexOf(block) === -1) {
+                    blocks.push(block);
+                }
+            });
+            return blocks.length === 1 ? {node: node, link: links[0]} : null;
+        }
+        node = node.parentElement;
+    }
+    return null;
+}
+"""
+
+# Clicks every reply control not already waiting on a load, in one round trip.
+# Each clicked control remembers its text; it counts as loaded once that text
+# changes ("Hide replies", "View more replies (n)") or the control goes away.
+EXPAND_REPLIES_SCRIPT = _JS_COMMENT_HELPERS + _JS_REPLY_HELPERS + """
+var container = arguments[0];
+var clicked = 0;
+replyButtons(container).forEach(function (button) {
+    var text = (button.innerText || '').trim();
+    if (button.getAttribute('data-ig-expanding') === text) {
+        return;
+    }
+    var root = threadRoot(button, container);
+    if (root) {
+        root.node.setAttribute('data-ig-reply-parent', root.link.getAttribute('href'));
+    }
+    button.setAttribute('data-ig-expanding', text);
+    button.click();
+    clicked++;
+});
+return clicked;
+"""
+
+REPLIES_PENDING_SCRIPT = """
+var pending = 0;
+arguments[0].querySelectorAll('[data-ig-expanding]').forEach(function (button) {
+    if ((button.innerText || '').trim() === button.getAttribute('data-ig-expanding')) {
+        pending++;
+    }
+});
+return pending;
+"""
+
+# Records for links inside an expanded thread, excluding the parent comment itself
+REPLY_SNAPSHOT_SCRIPT = _JS_COMMENT_HELPERS + """
+var container = arguments[0];
+var links = [];
+var parents = [];
+var replyTo = [];
+container.querySelectorAll('[data-ig-reply-parent]').forEach(function (root) {
+    var rootLinks = findUsernameLinks(root, false);
+    var parentBlock = rootLinks.length ? findCommentParent(rootLinks[0]) : null;
+    rootLinks.forEach(function (link) {
+        if (link.closest('[data-ig-reply-parent]') !== root) {
+            return;
+        }
+        var block = findCommentParent(link);
+        if (!block || block === parentBlock) {
+            return;
+        }
+        links.push(link);
+        parents.push(block);
+        replyTo.push(root.getAttribute('data-ig-reply-parent'));
+    });
+});
+var likesIndex = buildLikesIndex(container, parents);
+return links.map(function (link, i) {
+    return {
+        username: (link.innerText || '').trim(),
+        href: link.getAttribute('href'),
+        comment_id: commentId(parents[i]),
+        reply_to: replyTo[i],
+        span_texts: Array.prototype.map.call(parents[i].querySelectorAll("span[dir='auto']"), function (span) {
+            return (span.innerText || '').trim();
+        }),
+        like_texts: likesIndex[i]
+    };
+});
+"""
+
+
+def expand_reply_threads(driver, container, timeout=SCROLL_WAIT_TIMEOUT):
+    """
+    Click every visible "View replies" control at once and wait for all of them to load
+
+    Args:
+        driver: WebDriver instance
+        container: Comments container element
+        timeout (float): Maximum number of seconds to wait for the batch
+
+    Returns:
+        int: Number of reply controls clicked
+    """
+    try:
+        clicked = driver.execute_script(EXPAND_REPLIES_SCRIPT, container) or 0
+    except Exception as e:
+        print(f"  Error expanding reply threads: {e}")
+        return 0
+
+    if not clicked:
+        return 0
+
+    start_time = time.perf_counter()
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=SCROLL_POLL_INTERVAL).until(
+            lambda d: d.execute_script(REPLIES_PENDING_SCRIPT, container) == 0
+        )
+        print(f"  💬 Expanded {clicked} reply threads in {time.perf_counter() - start_time:.2f}s")
+    except TimeoutException:
+        print(f"  💬 Clicked {clicked} reply threads, some still loading after {timeout:.1f}s")
+    return clicked
+
+
+def extract_replies(driver, container, processed_comments):
+    """
+    Extract replies from expanded threads, tagged with the username they reply to
+
+    Args:
+        driver: WebDriver instance
+        container: Comments container element
+        processed_comments (set): Set to track processed comments
+
+    Returns:
+        CommentBatch: Extracted replies (reply_to set on every record)
+    """
+    batch = CommentBatch()
+
+    try:
+        records = driver.execute_script(REPLY_SNAPSHOT_SCRIPT, container) or []
+
+        for record in records:
+            username = (record.get("username") or "").strip()
+            if not is_valid_text(username) or username in FOOTER_TERMS:
+                continue
+
+            comment_text = _pick_comment_text(record.get("span_texts") or [], username)
+            if not comment_text or not is_valid_username_comment_pair(username, comment_text):
+                continue
+
+            likes_count = _likes_from_texts(record.get("like_texts") or [])
+            parent = (record.get("reply_to") or "").strip("/").split("/")[-1]
+            if _add_unique_comment(username, comment_text, processed_comments,
+                                 batch, likes_count, reply_to=parent,
+                                 comment_id=record.get("comment_id")):
+                print(f"  ↳ {username} (reply to {parent}): {comment_text[:60]}...")
+
+    except Exception as e:
+        print(f"  Error extracting replies: {e}")
+
+    return batch
@@ -1,41 +1,45 @@
 """
 Script to scrape comments for all posts of a given Instagram username.
 Usage:
-    python scrape_comments_for_user.py <instagram_username>
+    python scrape_comments_for_user.py <instagram_username> [--max-posts=N] [--since=YYYY-MM-DD] [options]
+
+Posts are discovered page by page while scraping runs, so the first post is scraped
+before the rest of the timeline has been fetched. Other options are the same as main_scraper.py.
 """
 
 import sys
 import os
+from datetime import datetime
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "InstagramPrivSniffer"))
-from InstagramPrivSniffer.main import main as sniffer_main
-from InstagramPrivSniffer.utils.parser import getArguments
-import subprocess
+from core.accountDataFetcher import stream_posts
+from dotenv import load_dotenv
+from session_runner import scrape_posts
+from main_scraper import AUTO_SCROLLS, parse_options
 
-DEFAULT_SCROLLS = 70
-MAIN_SCRAPER_PATH = "main_scraper.py"
+# Scroll each post until its reported comment count is reached instead of a fixed 70 scrolls
+DEFAULT_SCROLLS = AUTO_SCROLLS
 
 if __name__ == "__main__":
-    if len(sys.argv) < 2:
-        print("Usage: python scrape_comments_for_user.py <instagram_username>")
+    positional = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    options = parse_options([arg for arg in sys.argv[1:] if arg.startswith("--")])
+    if len(positional) != 1:
+        print("Usage: python scrape_comments_for_user.py <instagram_username> [--max-posts=N] [--since=YYYY-MM-DD] [options]")
         sys.exit(1)
-    username = sys.argv[1]
+    username = positional[0]
 
-    # Step 1: Get post links for the user
-    class Args:
-        def __init__(self, name=None, dload=None):
-            self.name = name
-            self.dload = dload
-    args = Args(name=username)
-    post_links = sniffer_main(args)
-    print(f"Found {len(post_links)} posts for user '{username}'")
+    try:
+        max_posts = int(options.pop("max-posts")) if "max-posts" in options else None
+        since = datetime.strptime(options.pop("since"), "%Y-%m-%d") if "since" in options else None
+    except (TypeError, ValueError) as e:
+        print(f"Invalid --max-posts/--since: {e}")
+        sys.exit(1)
+    if "scroll-wait" in options:
+        options["scroll-wait"] = float(options["scroll-wait"])
 
-    # Step 2: Run main_scraper.py for each post link
-    for idx, post_link in enumerate(post_links):
-        print(f"Scraping comments for post {idx+1}/{len(post_links)}: {post_link}")
-        # Output filename: <username>_<idx+1>.csv
-        output_filename = f"{username}_{idx+1}.csv"
-        cmd = [sys.executable, MAIN_SCRAPER_PATH, post_link, str(DEFAULT_SCROLLS), output_filename]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        print(result.stdout)
-        if result.stderr:
-            print("Error:", result.stderr)
+    # Step 1 + 2: Stream the user's post links into one logged-in browser session;
+    # later timeline pages are only requested once the posts before them are scraped
+    # Output filename: <username>_<idx+1>.csv
+    load_dotenv()
+    results = scrape_posts(stream_posts(username, max_posts, since), DEFAULT_SCROLLS,
+                           options=options, output_prefix=username)
+    print(f"Scraped {len(results)} posts for user '{username}'")
@@ -0,0 +1,206 @@
+"""
+Session Runner Module
+Scrapes many posts in one logged-in browser instead of a fresh browser and login per post.
+
+Usage:
+    python session_runner.py <urls_file> <number_of_scrolls|auto> [output_prefix] [options]
+
+urls_file has one post URL per line; outputs are <output_prefix>_<n>.csv.
+Options are the same as main_scraper.py (--engine, --incremental, --no-login, ...).
+"""
+
+import sys
+import time
+import traceback
+
+from dotenv import load_dotenv
+from selenium.common.exceptions import WebDriverException
+
+from browser_setup import setup_browser, close_browser
+from data_processor import save_debug_info
+from login_handler import login_to_instagram
+from main_scraper import parse_options, parse_scroll_budget, scrape_post
+
+
+class ScraperSession:
+    """One browser and login reused for every post; restarted only when the browser dies"""
+
+    def __init__(self, headless=False, login=True, lean=False):
+        """
+        Args:
+            headless (bool): Run the browser headless
+            login (bool): Log in to Instagram when the session starts
+            lean (bool): Use the lean browser profile (no images, media or fonts)
+        """
+        self.headless = headless
+        self.login = login
+        self.lean = lean
+        self.driver = None
+        self.restarts = 0
+        self.last_error = None  # why the last scrape() returned None
+
+    def start(self):
+        """
+        Start the browser and log in
+
+        Returns:
+            bool: True if the session is ready, False otherwise
+        """
+        start_time = time.perf_counter()
+        self.driver, _ = setup_browser(headless=self.headless, lean=self.lean)
+
+        if self.login and not login_to_instagram(self.driver):
+            self.close()
+            return False
+
+        print(f"🟢 Session ready in {time.perf_counter() - start_time:.1f}s")
+        return True
+
+    def is_alive(self):
+        """
+        Check whether the browser still answers
+
+        Returns:
+            bool: True if the browser is usable, False otherwise
+        """
+        if self.driver is None:
+            return False
+        try:
+            self.driver.window_handles
+            return True
+        except WebDriverException:
+            return False
+
+    def scrape(self, post_url, num_scrolls, custom_filename=None, options=None):
+        """
+        Scrape one post, recovering the session once if the browser dies mid-post
+
+        The retry after a recovery resumes from the post's checkpoint.
+
+        Args:
+            post_url (str): URL of the Instagram post
+            num_scrolls (int or str): Number of scroll iterations, or main_scraper.AUTO_SCROLLS
+            custom_filename (str, optional): Output CSV filename
+            options (dict, optional): Options as returned by main_scraper.parse_options
+
+        Returns:
+            CommentBatch or None: Exported comments, None if the post failed (reason in last_error)
+        """
+        self.last_error = None
+        for attempt in range(2):
+            if not self.is_alive():
+                if self.driver is not None:
+                    print("💥 Browser is gone, recovering session...")
+                    self.close()
+                    self.restarts += 1
+                if not self.start():
+                    self.last_error = "browser start or login failed"
+                    return None
+
+            post_options = dict(options or {}, resume=True) if attempt else options
+            try:
+                batch = scrape_post(self.driver, post_url, num_scrolls, custom_filename, post_options)
+                if batch is None:
+                    self.last_error = "navigation to the post failed"
+                return batch
+            except Exception as e:
+                self.last_error = e
+                if self.is_alive():
+                    # The page failed, not the browser: record it and move on
+                    print(f"\nAn error occurred: {e}")
+                    print(traceback.format_exc())
+                    save_debug_info(self.driver, error=e)
+                    return None
+                print(f"\nBrowser died while scraping {post_url}: {e}")
+
+        return None
+
+    def close(self):
+        """Close the browser"""
+        if self.driver is not None:
+            close_browser(self.driver)
+            self.driver = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def scrape_posts(post_urls, num_scrolls, output_filenames=None, options=None, headless=False, output_prefix=None):
+    """
+    Scrape a list of posts in one session
+
+    Args:
+        post_urls (iterable): Post URLs; a generator is consumed lazily, one post at a time
+        num_scrolls (int or str): Number of scroll iterations per post, or main_scraper.AUTO_SCROLLS
+        output_filenames (list, optional): Output CSV filename per post (timestamped names if omitted)
+        options (dict, optional): Options as returned by main_scraper.parse_options
+        headless (bool): Run the browser headless
+        output_prefix (str, optional): Name outputs <output_prefix>_<n>.csv when output_filenames is omitted
+
+    Returns:
+        dict: Post URL mapped to the number of comments extracted (None if the post failed)
+    """
+    options = options or {}
+    results = {}
+    run_start = time.perf_counter()
+    total = len(post_urls) if hasattr(post_urls, "__len__") else "?"
+
+    with ScraperSession(headless, not options.get("no-login"), bool(options.get("lean"))) as session:
+        for idx, post_url in enumerate(post_urls):
+            print(f"\n{'='*60}")
+            print(f"POST {idx+1}/{total}: {post_url}")
+            print(f"{'='*60}")
+
+            if output_filenames:
+                filename = output_filenames[idx]
+            else:
+                filename = f"{output_prefix}_{idx+1}.csv" if output_prefix else None
+            post_start = time.perf_counter()
+            batch = session.scrape(post_url, num_scrolls, filename, options)
+            results[post_url] = len(batch) if batch is not None else None
+            print(f"⏱️  Post {idx+1} took {time.perf_counter() - post_start:.1f}s")
+
+        restarts = session.restarts
+
+    failed = sum(1 for count in results.values() if count is None)
+    print(f"\n{'='*60}")
+    print(f"SESSION DONE: {len(results) - failed}/{len(results)} posts, "
+          f"{sum(count or 0 for count in results.values())} comments, "
+          f"{restarts} browser restarts, {time.perf_counter() - run_start:.1f}s total")
+    print(f"{'='*60}")
+    return results
+
+
+def read_post_urls(path):
+    """
+    Read post URLs from a file, one per line (blank lines and # comments skipped)
+
+    Args:
+        path (str): Path to the URL list
+
+    Returns:
+        list: Post URLs
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    positional = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    cli_options = parse_options([arg for arg in sys.argv[1:] if arg.startswith("--")])
+
+    if len(positional) < 2 or len(positional) > 3:
+        print("Usage: python session_runner.py <urls_file> <number_of_scrolls|auto> [output_prefix] [options]")
+        sys.exit(1)
+
+    urls = read_post_urls(positional[0])
+    prefix = positional[2] if len(positional) == 3 else None
+    if "scroll-wait" in cli_options:
+        cli_options["scroll-wait"] = float(cli_options["scroll-wait"])
+
+    scrape_posts(urls, parse_scroll_budget(positional[1]), options=cli_options, output_prefix=prefix)
@@ -4,6 +4,8 @@ Contains functions for validating and filtering text content.
 """
 
 import re
+import unicodedata
+from hashlib import blake2b
 
 
 # Common footer/navigation terms to filter out
@@ -14,6 +16,69 @@ FOOTER_TERMS = {
     "Log in", "Sign up", "More", "Liked", "Add a comment", "Post"
 }
 
+# Timestamps ("3h", "2w", "5 likes") and action words that are never comment text
+NOISE_PATTERN = re.compile(
+    r'(?:\d+\s*(?:h|m|d|w|s|mo|y|ago|like|likes)|Reply|View|Follow|Following|Like|Unlike)',
+    re.IGNORECASE
+)
+
+# Comment ids: bare digits or the id segment of a '/p/<code>/c/<id>/' permalink
+COMMENT_ID_PATTERN = re.compile(r'(?:^|/c/)(\d+)(?:/|$)')
+
+# Set on text-digest dedup keys so they can never equal a numeric comment id
+TEXT_KEY_FLAG = 1 << 63
+
+
+class TextValidator:
+    """
+    Text filter with its patterns and footer terms prepared once
+    
+    Use validate_many() to check a whole scroll's worth of spans in one call.
+    """
+    
+    def __init__(self, footer_terms=FOOTER_TERMS, noise_pattern=NOISE_PATTERN):
+        """
+        Args:
+            footer_terms (iterable): Exact texts to reject
+            noise_pattern (re.Pattern): Compiled pattern; texts it fully matches are rejected
+        """
+        self.footer_terms = frozenset(footer_terms)
+        self._is_noise = noise_pattern.fullmatch
+    
+    def is_valid(self, text, min_length=1):
+        """
+        Check if text is valid and meaningful
+        
+        Args:
+            text (str): Text to validate
+            min_length (int): Minimum length requirement
+            
+        Returns:
+            bool: True if text is valid, False otherwise
+        """
+        return (bool(text) and len(text) >= min_length and
+                text not in self.footer_terms and self._is_noise(text) is None)
+    
+    def validate_many(self, texts, min_length=1):
+        """
+        Validate a batch of texts
+        
+        Args:
+            texts (iterable): Texts to validate
+            min_length (int): Minimum length requirement
+            
+        Returns:
+            list: One bool per text, True where the text is valid
+        """
+        footer_terms = self.footer_terms
+        is_noise = self._is_noise
+        return [bool(text) and len(text) >= min_length and
+                text not in footer_terms and is_noise(text) is None
+                for text in texts]
+
+
+DEFAULT_VALIDATOR = TextValidator()
+
 
 def is_valid_text(text, min_length=1):
     """
@@ -26,21 +91,7 @@ def is_valid_text(text, min_length=1):
     Returns:
         bool: True if text is valid, False otherwise
     """
-    if not text or len(text) < min_length:
-        return False
-    
-    if text in FOOTER_TERMS:
-        return False
-    
-    # Skip timestamp patterns
-    if re.match(r'^\d+\s*(h|m|d|w|s|mo|y|ago|like|likes)$', text, re.IGNORECASE):
-        return False
-    
-    # Skip action words
-    if re.match(r'^(Reply|View|Follow|Following|Like|Unlike)$', text, re.IGNORECASE):
-        return False
-    
-    return True
+    return DEFAULT_VALIDATOR.is_valid(text, min_length)
 
 
 def is_valid_username(username):
@@ -114,16 +165,52 @@ def clean_comment_text(comment):
     return comment.replace('\n', ' ').strip() if comment else ""
 
 
-def create_comment_key(username, comment, max_length=50):
+def normalize_for_key(text):
+    """
+    Normalize text for deduplication (Unicode NFC, collapsed whitespace)
+    
+    Args:
+        text (str): Raw text
+        
+    Returns:
+        str: Normalized text
+    """
+    return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+
+def parse_comment_id(value):
+    """
+    Get a numeric comment id from an id string or a '/p/<code>/c/<id>/' permalink
+    
+    Args:
+        value (str or int): Comment id or permalink href
+        
+    Returns:
+        str or None: Digits of the comment id, None if there is none
+    """
+    if value is None:
+        return None
+    match = COMMENT_ID_PATTERN.search(str(value))
+    return match.group(1) if match else None
+
+
+def create_comment_key(username, comment, comment_id=None):
     """
     Create a unique key for comment deduplication
     
+    When the comment id is known it is the key. Otherwise the key is a 64-bit
+    blake2b digest of the full normalized (username, comment) pair with the top
+    bit set; Instagram ids stay below 2**63, so the two kinds never collide.
+    
     Args:
         username (str): Username
         comment (str): Comment text
-        max_length (int): Maximum length of comment portion in key
+        comment_id (str, optional): Instagram comment id
         
     Returns:
-        str: Unique comment key
+        int: Comment key
     """
-    return f"{username}:{comment[:max_length]}"
\ No newline at end of file
+    if comment_id:
+        return int(comment_id)
+    payload = f"{normalize_for_key(username)}\x00{normalize_for_key(comment)}".encode("utf-8")
+    return int.from_bytes(blake2b(payload, digest_size=8).digest(), "big") | TEXT_KEY_FLAG